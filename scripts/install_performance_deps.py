@@ -22,6 +22,7 @@ def main():
     
     dependencies = [
         "psutil>=5.9.0",  # System and process monitoring
+        "orjson>=3.9.0",  # Faster JSON for performance_monitor.py output and receiver.py POSTs (optional)
     ]
     
     failed_packages = []
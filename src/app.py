@@ -23,6 +23,11 @@ from config import (
 )
 from datacloud_integration import create_datacloud_client
 
+try:
+    import orjson  # Optional: C JSON encoder for the SSE stream
+except ImportError:
+    orjson = None
+
 # Load environment variables from .env file if present
 load_dotenv()
 
@@ -30,6 +35,15 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+if orjson is not None:
+    def encode_json(obj) -> str:
+        """Serialize telemetry for the SSE stream"""
+        return orjson.dumps(obj).decode('utf-8')
+else:
+    def encode_json(obj) -> str:
+        """Serialize telemetry for the SSE stream"""
+        return json.dumps(obj)
+
 # Get the parent directory of src/ which contains templates and static folders
 parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 app = Flask(__name__,
@@ -493,7 +507,7 @@ def receive_data():
 
     # Convert back to JSON string for the queue
     try:
-        json_data = json.dumps(data)
+        json_data = encode_json(data)
         message_queue.put(json_data) # Put the full JSON string into the queue
     except TypeError as e:
         logger.error(f"Error serializing data to JSON: {e}. Data: {data}")
@@ -515,7 +529,7 @@ def stream():
 
         if current_state:
             try:
-                yield f"data: {json.dumps(current_state)}\n\n"
+                yield f"data: {encode_json(current_state)}\n\n"
             except TypeError as e:
                  logger.error(f"Error serializing initial state to JSON: {e}")
 
@@ -14,11 +14,17 @@ import logging
 import os
 import psutil
 import threading
+from collections import deque
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any, Tuple
+from typing import Callable, ClassVar, Deque, List, Optional, Dict, Any, Tuple
 from dotenv import load_dotenv
 from datacloud_integration import create_datacloud_client
 
+try:
+    import orjson  # Optional: C JSON encoder for the POST body
+except ImportError:
+    orjson = None
+
 # --- Constants ---
 APP_NAME = "F1 24 Telemetry Bridge"
 DEFAULT_UDP_IP = "0.0.0.0"
@@ -33,12 +39,37 @@ BACKOFF_RESET_THRESHOLD = MAX_SEND_RETRIES + 3 # Retries after which backoff int
 SOCKET_TIMEOUT_S = 1.0
 STATUS_UPDATE_INTERVAL_S = 60.0
 PACKET_BUFFER_SIZE = 2048
+UDP_RECV_BUFFER_BYTES = 1024 * 1024 # Kernel receive buffer: ~5s of telemetry (~200 KB/s) to ride out stalls in the loop
+MAX_LAP_TIME_MS = 600000 # Lap times above 10 minutes are treated as invalid
+GEAR_SLOTS = 9 # Neutral plus gears 1-8, for the lap gear histogram
+IDLE_SEND_INTERVAL_S = 1.0 # Heartbeat payload interval while no new packets are handled
+SENDER_SHUTDOWN_TIMEOUT_S = 15.0 # Time allowed on shutdown for queued payloads to be posted
 
 # Performance monitoring constants
 LOG_THROTTLE_INTERVAL_S = 10.0  # Log debug messages every 10 seconds
 STATUS_LOG_INTERVAL_S = 30.0    # Status updates every 30 seconds
 PERFORMANCE_MODE = True         # Enable performance optimizations (async sends, reduced logging)
 
+if orjson is not None:
+    def encode_payload(payload: Dict[str, Any]) -> bytes:
+        """Serialize a telemetry payload as the JSON POST body"""
+        return orjson.dumps(payload)
+else:
+    def encode_payload(payload: Dict[str, Any]) -> bytes:
+        """Serialize a telemetry payload as the JSON POST body"""
+        return json.dumps(payload, separators=(',', ':')).encode('utf-8')
+
+def set_udp_recv_buffer(sock: socket.socket, size: int = UDP_RECV_BUFFER_BYTES):
+    """Enlarge a UDP socket's receive buffer so packet bursts aren't dropped while the loop is busy.
+
+    OS defaults (64 KB on Windows) hold well under a second of telemetry. The OS may clamp
+    the size (Linux caps it at net.core.rmem_max); failure is logged and ignored.
+    """
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, size)
+    except OSError as e:
+        logging.warning(f"Could not set UDP receive buffer size: {e}")
+
 # Packet IDs (From F1 24 Spec Page 2/3)
 PACKET_ID_MOTION = 0
 PACKET_ID_SESSION = 1
@@ -77,20 +108,38 @@ class PacketHeader:
     # Format verified against F1 24 Spec Page 2
     HEADER_FORMAT: str = "<HBBBBBQfIIBB"
     SIZE: int = struct.calcsize(HEADER_FORMAT)
+    PACKET_ID_OFFSET: ClassVar[int] = 6  # After m_packetFormat (uint16) and four uint8 version fields
+
+    @classmethod
+    def peek_packet_id(cls, data: bytes) -> Optional[int]:
+        """Reads m_packetId straight from the datagram, without unpacking the rest of the header."""
+        if len(data) < cls.SIZE:
+            return None
+        return data[cls.PACKET_ID_OFFSET]
+
+    @classmethod
+    def peek_packet_format(cls, data: bytes) -> Optional[int]:
+        """Reads m_packetFormat (uint16 LE, the first two bytes) without unpacking the rest of the header."""
+        if len(data) < cls.SIZE:
+            return None
+        return data[0] | (data[1] << 8)
 
     @classmethod
     def from_bytes(cls, data: bytes) -> Optional['PacketHeader']:
         if len(data) < cls.SIZE:
             return None
         try:
-            unpacked = struct.unpack(cls.HEADER_FORMAT, data[:cls.SIZE])
-            return cls(*unpacked)
+            return cls(*HEADER_STRUCT.unpack_from(data))
         except struct.error as e:
             logging.error(f"Failed to unpack PacketHeader: {e}")
             return None
 
+# Precompiled packet formats: Struct objects parse their format once, and
+# unpack_from reads in place without slicing the datagram
+HEADER_STRUCT = struct.Struct(PacketHeader.HEADER_FORMAT)
+
 # --- LapData Structures (F1 24 Spec Pages 5-6) ---
-@dataclass
+@dataclass(slots=True)
 class LapData:
     # Field names MUST match the exact structure from the F1 24 spec
     m_lastLapTimeInMS: int          # uint32
@@ -125,16 +174,16 @@ class LapData:
     m_pitStopTimerInMS: int         # uint16
     m_pitStopShouldServePen: int    # uint8
     m_speedTrapFastestSpeed: float  # float
-    m_speedTrapFastestLap: int = 0  # uint8 (default to 0 if missing)
+    m_speedTrapFastestLap: int = 0  # uint8 (255 = not set)
 
-    # Format string exactly matching the F1 24 spec
-    LAP_DATA_FORMAT: str = "<IIHBHBHBHBfffBBBBBBBBBBBBBBHHBfB"
-    
-    # Alternative format string for F1 24 if it's missing the last field
-    LAP_DATA_FORMAT_NO_FASTEST_LAP: str = "<IIHBHBHBHBfffBBBBBBBBBBBBBBHHBf"
-    
-    # Use the format with all fields, adjust at runtime if needed
-    SIZE: int = struct.calcsize(LAP_DATA_FORMAT_NO_FASTEST_LAP)
+    # Format string exactly matching the F1 24/25 spec: 15 uint8 fields from
+    # m_carPosition to m_pitLaneTimerActive, 57 bytes per car
+    LAP_DATA_FORMAT: ClassVar[str] = "<IIHBHBHBHBfffBBBBBBBBBBBBBBBHHBfB"
+    SIZE: ClassVar[int] = struct.calcsize(LAP_DATA_FORMAT)
+
+# Precompiled once; PacketLapData decodes every car's record through it
+LAP_DATA_STRUCT = struct.Struct(LapData.LAP_DATA_FORMAT)
+LAP_DATA_EXTRA_STRUCT = struct.Struct("<BB") # timeTrialPBCarIdx, timeTrialRivalCarIdx
 
 @dataclass
 class PacketLapData:
@@ -149,69 +198,36 @@ class PacketLapData:
     @classmethod
     def from_bytes(cls, header: PacketHeader, data: bytes) -> Optional['PacketLapData']:
         packet = cls(m_header=header)
-        lap_data_bytes = data # For standard LapData packet
 
         required_lap_data_size = LapData.SIZE * cls.NUM_CARS
 
         # Check if the extra indices might be present (packet slightly longer)
-        extra_indices_size = 2 # 2 * uint8
+        extra_indices_size = LAP_DATA_EXTRA_STRUCT.size # 2 * uint8
         if len(data) >= required_lap_data_size + extra_indices_size:
              try: # Add try-except for unpacking extra indices
-                 indices = struct.unpack("<BB", data[required_lap_data_size : required_lap_data_size + extra_indices_size])
+                 indices = LAP_DATA_EXTRA_STRUCT.unpack_from(data, required_lap_data_size)
                  packet.m_timeTrialPBCarIdx = indices[0]
                  packet.m_timeTrialRivalCarIdx = indices[1]
-                 logging.debug("Found and parsed extra TimeTrial indices.")
              except struct.error as e:
                  logging.warning(f"Could not unpack potential extra indices: {e}")
                  # Assume they aren't there or packet is malformed
-             # Process only the lap data part for the main list
-             lap_data_bytes = data[:required_lap_data_size]
-             logging.debug(f"Adjusted lap_data_bytes length to {len(lap_data_bytes)} after finding potential extra indices.")
         elif len(data) < required_lap_data_size:
             logging.warning(f"LapData packet too short. Expected at least {required_lap_data_size}, got {len(data)}")
             return None
 
-        format_str = LapData.LAP_DATA_FORMAT_NO_FASTEST_LAP
-        expected_fields = 32  # F1 24/25 spec without m_speedTrapFastestLap
-
-        for i in range(cls.NUM_CARS):
-            start = i * LapData.SIZE
-            end = start + LapData.SIZE
+        # Process only the lap data part for the main list (a view, not a copy)
+        lap_data_bytes = memoryview(data)[:required_lap_data_size]
 
-            if end > len(lap_data_bytes):
-                logging.warning(f"Insufficient data for lap data of car {i}")
-                break
-
-            try:
-                current_chunk = lap_data_bytes[start:end]
-                lap_tuple = struct.unpack(format_str, current_chunk)
-                actual_tuple_len = len(lap_tuple)
-
-                # Handle format variations between F1 24/25
-                if actual_tuple_len == expected_fields:
-                    lap_entry = LapData(*lap_tuple, m_speedTrapFastestLap=0)
-                elif actual_tuple_len == expected_fields + 1:
-                    lap_entry = LapData(*lap_tuple)
-                elif actual_tuple_len == expected_fields - 1:
-                    modified_tuple = lap_tuple + (0.0, 0)
-                    lap_entry = LapData(*modified_tuple)
-                else:
-                    logging.warning(f"Unexpected LapData tuple length for car {i}: {actual_tuple_len}")
-                    continue
-
-                packet.m_lapData.append(lap_entry)
-
-            except struct.error as e:
-                logging.error(f"Failed to unpack LapData for car {i}: {e}")
-                continue
-            except (TypeError, ValueError) as e:
-                logging.error(f"Error creating LapData for car {i}: {e}")
-                continue
+        # Decode all cars in one C-level pass over the block - no per-car slicing
+        # or format-string lookups. The layout is the same for F1 24 and F1 25,
+        # so every tuple maps directly onto LapData
+        packet.m_lapData = [LapData(*lap_tuple)
+                            for lap_tuple in LAP_DATA_STRUCT.iter_unpack(lap_data_bytes)]
 
         return packet
 
 # --- CarTelemetry Structures (F1 24 Spec Page 10) ---
-@dataclass
+@dataclass(slots=True)
 class CarTelemetryData:
     m_speed: int                        # uint16
     m_throttle: float                   # float
@@ -223,16 +239,19 @@ class CarTelemetryData:
     m_drs: int                          # uint8
     m_revLightsPercent: int             # uint8
     m_revLightsBitValue: int            # uint16
-    m_brakesTemperature: List[int]      # uint16[4]
-    m_tyresSurfaceTemperature: List[int] # uint8[4]
-    m_tyresInnerTemperature: List[int]  # uint8[4]
+    m_brakesTemperature: Tuple[int, ...] # uint16[4]
+    m_tyresSurfaceTemperature: Tuple[int, ...] # uint8[4]
+    m_tyresInnerTemperature: Tuple[int, ...] # uint8[4]
     m_engineTemperature: int            # uint16
-    m_tyresPressure: List[float]        # float[4]
-    m_surfaceType: List[int]            # uint8[4]
+    m_tyresPressure: Tuple[float, ...]  # float[4]
+    m_surfaceType: Tuple[int, ...]      # uint8[4]
 
     # Format verified against F1 24 Spec Page 10
-    TELEMETRY_DATA_FORMAT: str = "<HfffBbHBBH 4H 4B 4B H 4f 4B"
-    SIZE: int = struct.calcsize(TELEMETRY_DATA_FORMAT)
+    TELEMETRY_DATA_FORMAT: ClassVar[str] = "<HfffBbHBBH 4H 4B 4B H 4f 4B"
+    SIZE: ClassVar[int] = struct.calcsize(TELEMETRY_DATA_FORMAT)
+
+CAR_TELEMETRY_STRUCT = struct.Struct(CarTelemetryData.TELEMETRY_DATA_FORMAT)
+CAR_TELEMETRY_EXTRA_STRUCT = struct.Struct("<BBb") # mfdPanelIndex, mfdPanelIndexSecondaryPlayer, suggestedGear
 
 @dataclass
 class PacketCarTelemetry:
@@ -254,52 +273,39 @@ class PacketCarTelemetry:
              logging.warning(f"Telemetry packet too short for car data. Expected {telemetry_data_size}, got {len(data)}")
              return None
 
-        telemetry_data_bytes = data[:telemetry_data_size]
-
-        # Parse the car-specific data
-        for i in range(cls.NUM_CARS):
-            start = i * CarTelemetryData.SIZE
-            end = start + CarTelemetryData.SIZE
-            if end > len(telemetry_data_bytes):
-                 logging.warning(f"Insufficient data for telemetry of car {i}")
-                 break # Should not happen if initial length check passes
-            try:
-                telemetry_tuple = struct.unpack(CarTelemetryData.TELEMETRY_DATA_FORMAT, telemetry_data_bytes[start:end])
-                # Map tuple elements to dataclass fields, handling arrays
-                telemetry_entry = CarTelemetryData(
-                     m_speed=telemetry_tuple[0],
-                     m_throttle=telemetry_tuple[1],
-                     m_steer=telemetry_tuple[2],
-                     m_brake=telemetry_tuple[3],
-                     m_clutch=telemetry_tuple[4],
-                     m_gear=telemetry_tuple[5],
-                     m_engineRPM=telemetry_tuple[6],
-                     m_drs=telemetry_tuple[7],
-                     m_revLightsPercent=telemetry_tuple[8],
-                     m_revLightsBitValue=telemetry_tuple[9],
-                     m_brakesTemperature=list(telemetry_tuple[10:14]), # Indices 10, 11, 12, 13
-                     m_tyresSurfaceTemperature=list(telemetry_tuple[14:18]),# Indices 14, 15, 16, 17
-                     m_tyresInnerTemperature=list(telemetry_tuple[18:22]),# Indices 18, 19, 20, 21
-                     m_engineTemperature=telemetry_tuple[22],         # Index 22
-                     m_tyresPressure=list(telemetry_tuple[23:27]),     # Indices 23, 24, 25, 26
-                     m_surfaceType=list(telemetry_tuple[27:31])        # Indices 27, 28, 29, 30
-                )
-                packet.m_carTelemetryData.append(telemetry_entry)
-            except struct.error as e:
-                logging.error(f"Failed to unpack CarTelemetryData for car {i}: {e}")
-                continue
-            except IndexError as e:
-                logging.error(f"Index error mapping CarTelemetryData fields for car {i}: {e}. Tuple length: {len(telemetry_tuple)}")
-                continue
+        telemetry_data_bytes = memoryview(data)[:telemetry_data_size]
+        append_telemetry = packet.m_carTelemetryData.append
+
+        # Parse the car-specific data - one C-level pass over all cars
+        for telemetry_tuple in CAR_TELEMETRY_STRUCT.iter_unpack(telemetry_data_bytes):
+            # Map tuple elements to dataclass fields, handling arrays
+            telemetry_entry = CarTelemetryData(
+                 m_speed=telemetry_tuple[0],
+                 m_throttle=telemetry_tuple[1],
+                 m_steer=telemetry_tuple[2],
+                 m_brake=telemetry_tuple[3],
+                 m_clutch=telemetry_tuple[4],
+                 m_gear=telemetry_tuple[5],
+                 m_engineRPM=telemetry_tuple[6],
+                 m_drs=telemetry_tuple[7],
+                 m_revLightsPercent=telemetry_tuple[8],
+                 m_revLightsBitValue=telemetry_tuple[9],
+                 m_brakesTemperature=telemetry_tuple[10:14],       # Indices 10, 11, 12, 13
+                 m_tyresSurfaceTemperature=telemetry_tuple[14:18], # Indices 14, 15, 16, 17
+                 m_tyresInnerTemperature=telemetry_tuple[18:22],   # Indices 18, 19, 20, 21
+                 m_engineTemperature=telemetry_tuple[22],         # Index 22
+                 m_tyresPressure=telemetry_tuple[23:27],           # Indices 23, 24, 25, 26
+                 m_surfaceType=telemetry_tuple[27:31]              # Indices 27, 28, 29, 30
+            )
+            append_telemetry(telemetry_entry)
 
         # Parse the packet-level fields (MFD Index etc.) that follow the array
         extra_fields_offset = telemetry_data_size
-        extra_fields_format = "<BBb" # mfdPanelIndex, mfdPanelIndexSecondaryPlayer, suggestedGear
-        extra_fields_size = struct.calcsize(extra_fields_format)
+        extra_fields_size = CAR_TELEMETRY_EXTRA_STRUCT.size
 
         if len(data) >= extra_fields_offset + extra_fields_size:
             try:
-                extra_tuple = struct.unpack(extra_fields_format, data[extra_fields_offset : extra_fields_offset + extra_fields_size])
+                extra_tuple = CAR_TELEMETRY_EXTRA_STRUCT.unpack_from(data, extra_fields_offset)
                 packet.m_mfdPanelIndex = extra_tuple[0]
                 packet.m_mfdPanelIndexSecondaryPlayer = extra_tuple[1]
                 packet.m_suggestedGear = extra_tuple[2]
@@ -311,7 +317,7 @@ class PacketCarTelemetry:
         return packet
 
 # --- CarStatus Structures (F1 24 Spec Pages 10-11) ---
-@dataclass
+@dataclass(slots=True)
 class CarStatusData:
     m_tractionControl: int              # uint8
     m_antiLockBrakes: int               # uint8
@@ -339,11 +345,11 @@ class CarStatusData:
     m_ersDeployedThisLap: float         # float
     m_networkPaused: int                # uint8 (0=active, 1=paused)
 
-    # FIX APPLIED: Corrected format string based on spec and test failures
-    # Spec order: 5xB, 3xf, 2xH, 3xB, 1xH, 3xB, 1xb, 2xf, 1xf, 1xB, 3xf, 1xB = 27 items
-    CAR_STATUS_FORMAT: str = "<BBBBB fff HH BBH BBB b ff f B fff B" # Strict spec order
-    SIZE: int = struct.calcsize(CAR_STATUS_FORMAT) # Recalculate size
+    # Spec order: 5xB, 3xf, 2xH, 3xB, 1xH, 3xB, 1xb, 2xf, 1xf, 1xB, 3xf, 1xB = 25 items
+    CAR_STATUS_FORMAT: ClassVar[str] = "<BBBBB fff HH BBH BBB b ff f B fff B" # Strict spec order
+    SIZE: ClassVar[int] = struct.calcsize(CAR_STATUS_FORMAT)
 
+CAR_STATUS_STRUCT = struct.Struct(CarStatusData.CAR_STATUS_FORMAT)
 
 @dataclass
 class PacketCarStatus:
@@ -360,30 +366,18 @@ class PacketCarStatus:
              logging.warning(f"CarStatus packet too short. Expected {expected_size}, got {len(data)}")
              return None
 
-        for i in range(cls.NUM_CARS):
-             start = i * CarStatusData.SIZE
-             end = start + CarStatusData.SIZE
-             if end > len(data):
-                 logging.warning(f"Insufficient data for car status of car {i}")
-                 break # Should not happen
-             try:
-                 status_tuple = struct.unpack(CarStatusData.CAR_STATUS_FORMAT, data[start:end])
-                 status_entry = CarStatusData(*status_tuple) # Direct map
-                 packet.m_carStatusData.append(status_entry)
-             except struct.error as e:
-                 logging.error(f"Failed to unpack CarStatusData for car {i}: {e}")
-                 continue
-             except IndexError as e:
-                 logging.error(f"Index error mapping CarStatusData fields for car {i}: {e}. Check format/dataclass.")
-                 continue
+        # Every field is a scalar in spec order, so each unpacked tuple maps straight
+        # onto CarStatusData - one C-level pass over all cars
+        packet.m_carStatusData = [CarStatusData(*status_tuple)
+                                  for status_tuple in CAR_STATUS_STRUCT.iter_unpack(memoryview(data)[:expected_size])]
         return packet
 
 # --- CarDamage Structures (F1 24 Spec Pages 12-13) ---
-@dataclass
+@dataclass(slots=True)
 class CarDamageData:
-    m_tyresWear: List[float]            # float[4] (RL, RR, FL, FR) %
-    m_tyresDamage: List[int]            # uint8[4] (%)
-    m_brakesDamage: List[int]           # uint8[4] (%)
+    m_tyresWear: Tuple[float, ...]      # float[4] (RL, RR, FL, FR) %
+    m_tyresDamage: Tuple[int, ...]      # uint8[4] (%)
+    m_brakesDamage: Tuple[int, ...]     # uint8[4] (%)
     m_frontLeftWingDamage: int          # uint8 (%)
     m_frontRightWingDamage: int         # uint8 (%)
     m_rearWingDamage: int               # uint8 (%)
@@ -402,15 +396,18 @@ class CarDamageData:
     m_engineTCWear: int                 # uint8 (%)
     m_engineBlown: int                  # uint8 (0=OK, 1=fault)
     m_engineSeized: int                 # uint8 (0=OK, 1=fault)
-    m_tyreBlisters: List[int] = field(default_factory=lambda: [0, 0, 0, 0])  # uint8[4] F1 25 only (RL, RR, FL, FR) %
+    m_tyreBlisters: Tuple[int, ...] = (0, 0, 0, 0)  # uint8[4] F1 25 only (RL, RR, FL, FR) %
 
     # Format verified against F1 25/24 Spec Pages 12-13
     # F1 25 format includes tyre blisters
-    CAR_DAMAGE_FORMAT_F125: str = "<4f 4B 4B 4B BBBBBB BB BBBBBBBB BB"
+    CAR_DAMAGE_FORMAT_F125: ClassVar[str] = "<4f 4B 4B 4B BBBBBB BB BBBBBBBB BB"
     # F1 24 format (backwards compatibility)
-    CAR_DAMAGE_FORMAT_F124: str = "<4f 4B 4B BBBBBB BB BBBBBBBB BB"
-    SIZE_F125: int = struct.calcsize(CAR_DAMAGE_FORMAT_F125)
-    SIZE_F124: int = struct.calcsize(CAR_DAMAGE_FORMAT_F124)
+    CAR_DAMAGE_FORMAT_F124: ClassVar[str] = "<4f 4B 4B BBBBBB BB BBBBBBBB BB"
+    SIZE_F125: ClassVar[int] = struct.calcsize(CAR_DAMAGE_FORMAT_F125)
+    SIZE_F124: ClassVar[int] = struct.calcsize(CAR_DAMAGE_FORMAT_F124)
+
+CAR_DAMAGE_STRUCT_F125 = struct.Struct(CarDamageData.CAR_DAMAGE_FORMAT_F125)
+CAR_DAMAGE_STRUCT_F124 = struct.Struct(CarDamageData.CAR_DAMAGE_FORMAT_F124)
 
 @dataclass
 class PacketCarDamage:
@@ -425,87 +422,78 @@ class PacketCarDamage:
 
         # Determine format based on game version
         is_f125 = header.m_packetFormat == 2025
-        car_damage_size = CarDamageData.SIZE_F125 if is_f125 else CarDamageData.SIZE_F124
-        car_damage_format = CarDamageData.CAR_DAMAGE_FORMAT_F125 if is_f125 else CarDamageData.CAR_DAMAGE_FORMAT_F124
+        car_damage_struct = CAR_DAMAGE_STRUCT_F125 if is_f125 else CAR_DAMAGE_STRUCT_F124
+        car_damage_size = car_damage_struct.size
 
         expected_size = car_damage_size * cls.NUM_CARS
         if len(data) < expected_size:
              logging.warning(f"CarDamage packet too short. Expected {expected_size}, got {len(data)}")
              return None
 
-        for i in range(cls.NUM_CARS):
-            start = i * car_damage_size
-            end = start + car_damage_size
-            if end > len(data):
-                 logging.warning(f"Insufficient data for car damage of car {i}")
-                 break # Should not happen
-            try:
-                damage_tuple = struct.unpack(car_damage_format, data[start:end])
-
-                # Map tuple elements based on format version
-                if is_f125:
-                    # F1 25 format includes tyre blisters
-                    damage_entry = CarDamageData(
-                        m_tyresWear=list(damage_tuple[0:4]),         # Indices 0, 1, 2, 3
-                        m_tyresDamage=list(damage_tuple[4:8]),       # Indices 4, 5, 6, 7
-                        m_brakesDamage=list(damage_tuple[8:12]),     # Indices 8, 9, 10, 11
-                        m_tyreBlisters=list(damage_tuple[12:16]),    # Indices 12, 13, 14, 15 (NEW in F1 25)
-                        m_frontLeftWingDamage=damage_tuple[16],      # Index 16
-                        m_frontRightWingDamage=damage_tuple[17],     # Index 17
-                        m_rearWingDamage=damage_tuple[18],           # Index 18
-                        m_floorDamage=damage_tuple[19],              # Index 19
-                        m_diffuserDamage=damage_tuple[20],           # Index 20
-                        m_sidepodDamage=damage_tuple[21],            # Index 21
-                        m_drsFault=damage_tuple[22],                 # Index 22
-                        m_ersFault=damage_tuple[23],                 # Index 23
-                        m_gearBoxDamage=damage_tuple[24],            # Index 24
-                        m_engineDamage=damage_tuple[25],             # Index 25
-                        m_engineMGUHWear=damage_tuple[26],           # Index 26
-                        m_engineESWear=damage_tuple[27],             # Index 27
-                        m_engineCEWear=damage_tuple[28],             # Index 28
-                        m_engineICEWear=damage_tuple[29],            # Index 29
-                        m_engineMGUKWear=damage_tuple[30],           # Index 30
-                        m_engineTCWear=damage_tuple[31],             # Index 31
-                        m_engineBlown=damage_tuple[32],              # Index 32
-                        m_engineSeized=damage_tuple[33]              # Index 33
-                    )
-                else:
-                    # F1 24 format (no tyre blisters)
-                    damage_entry = CarDamageData(
-                        m_tyresWear=list(damage_tuple[0:4]),         # Indices 0, 1, 2, 3
-                        m_tyresDamage=list(damage_tuple[4:8]),       # Indices 4, 5, 6, 7
-                        m_brakesDamage=list(damage_tuple[8:12]),     # Indices 8, 9, 10, 11
-                        m_tyreBlisters=[0, 0, 0, 0],                 # Default for F1 24
-                        m_frontLeftWingDamage=damage_tuple[12],      # Index 12
-                        m_frontRightWingDamage=damage_tuple[13],     # Index 13
-                        m_rearWingDamage=damage_tuple[14],           # Index 14
-                        m_floorDamage=damage_tuple[15],              # Index 15
-                        m_diffuserDamage=damage_tuple[16],           # Index 16
-                        m_sidepodDamage=damage_tuple[17],            # Index 17
-                        m_drsFault=damage_tuple[18],                 # Index 18
-                        m_ersFault=damage_tuple[19],                 # Index 19
-                        m_gearBoxDamage=damage_tuple[20],            # Index 20
-                        m_engineDamage=damage_tuple[21],             # Index 21
-                        m_engineMGUHWear=damage_tuple[22],           # Index 22
-                        m_engineESWear=damage_tuple[23],             # Index 23
-                        m_engineCEWear=damage_tuple[24],             # Index 24
-                        m_engineICEWear=damage_tuple[25],            # Index 25
-                        m_engineMGUKWear=damage_tuple[26],           # Index 26
-                        m_engineTCWear=damage_tuple[27],             # Index 27
-                        m_engineBlown=damage_tuple[28],              # Index 28
-                        m_engineSeized=damage_tuple[29]              # Index 29
-                    )
+        append_damage = packet.m_carDamageData.append
+
+        # One C-level pass over all cars
+        for damage_tuple in car_damage_struct.iter_unpack(memoryview(data)[:expected_size]):
+            # Map tuple elements based on format version
+            if is_f125:
+                # F1 25 format includes tyre blisters
+                damage_entry = CarDamageData(
+                    m_tyresWear=damage_tuple[0:4],               # Indices 0, 1, 2, 3
+                    m_tyresDamage=damage_tuple[4:8],             # Indices 4, 5, 6, 7
+                    m_brakesDamage=damage_tuple[8:12],           # Indices 8, 9, 10, 11
+                    m_tyreBlisters=damage_tuple[12:16],          # Indices 12, 13, 14, 15 (NEW in F1 25)
+                    m_frontLeftWingDamage=damage_tuple[16],      # Index 16
+                    m_frontRightWingDamage=damage_tuple[17],     # Index 17
+                    m_rearWingDamage=damage_tuple[18],           # Index 18
+                    m_floorDamage=damage_tuple[19],              # Index 19
+                    m_diffuserDamage=damage_tuple[20],           # Index 20
+                    m_sidepodDamage=damage_tuple[21],            # Index 21
+                    m_drsFault=damage_tuple[22],                 # Index 22
+                    m_ersFault=damage_tuple[23],                 # Index 23
+                    m_gearBoxDamage=damage_tuple[24],            # Index 24
+                    m_engineDamage=damage_tuple[25],             # Index 25
+                    m_engineMGUHWear=damage_tuple[26],           # Index 26
+                    m_engineESWear=damage_tuple[27],             # Index 27
+                    m_engineCEWear=damage_tuple[28],             # Index 28
+                    m_engineICEWear=damage_tuple[29],            # Index 29
+                    m_engineMGUKWear=damage_tuple[30],           # Index 30
+                    m_engineTCWear=damage_tuple[31],             # Index 31
+                    m_engineBlown=damage_tuple[32],              # Index 32
+                    m_engineSeized=damage_tuple[33]              # Index 33
+                )
+            else:
+                # F1 24 format (no tyre blisters)
+                damage_entry = CarDamageData(
+                    m_tyresWear=damage_tuple[0:4],               # Indices 0, 1, 2, 3
+                    m_tyresDamage=damage_tuple[4:8],             # Indices 4, 5, 6, 7
+                    m_brakesDamage=damage_tuple[8:12],           # Indices 8, 9, 10, 11
+                    m_tyreBlisters=(0, 0, 0, 0),                 # Default for F1 24
+                    m_frontLeftWingDamage=damage_tuple[12],      # Index 12
+                    m_frontRightWingDamage=damage_tuple[13],     # Index 13
+                    m_rearWingDamage=damage_tuple[14],           # Index 14
+                    m_floorDamage=damage_tuple[15],              # Index 15
+                    m_diffuserDamage=damage_tuple[16],           # Index 16
+                    m_sidepodDamage=damage_tuple[17],            # Index 17
+                    m_drsFault=damage_tuple[18],                 # Index 18
+                    m_ersFault=damage_tuple[19],                 # Index 19
+                    m_gearBoxDamage=damage_tuple[20],            # Index 20
+                    m_engineDamage=damage_tuple[21],             # Index 21
+                    m_engineMGUHWear=damage_tuple[22],           # Index 22
+                    m_engineESWear=damage_tuple[23],             # Index 23
+                    m_engineCEWear=damage_tuple[24],             # Index 24
+                    m_engineICEWear=damage_tuple[25],            # Index 25
+                    m_engineMGUKWear=damage_tuple[26],           # Index 26
+                    m_engineTCWear=damage_tuple[27],             # Index 27
+                    m_engineBlown=damage_tuple[28],              # Index 28
+                    m_engineSeized=damage_tuple[29]              # Index 29
+                )
 
-                packet.m_carDamageData.append(damage_entry)
-            except struct.error as e:
-                logging.error(f"Failed to unpack CarDamageData for car {i}: {e}")
-                continue
-            except IndexError as e:
-                logging.error(f"Index error mapping CarDamageData fields for car {i}: {e}. Check format/dataclass. Tuple length: {len(damage_tuple)}")
-                continue
+            append_damage(damage_entry)
         return packet
 
 # --- Session Packet Structure (F1 24 Spec) ---
+SESSION_HEAD_STRUCT = struct.Struct("<BbbBHBb")  # weather, trackTemp, airTemp, totalLaps, trackLength, sessionType, trackId
+
 @dataclass
 class PacketSessionData:
     m_header: PacketHeader
@@ -524,8 +512,7 @@ class PacketSessionData:
             return None
         try:
             # Parse only the fields we need (up to trackId at offset 7)
-            session_format = "<BbbBHBb"  # weather, trackTemp, airTemp, totalLaps, trackLength, sessionType, trackId
-            unpacked = struct.unpack(session_format, data[:8])
+            unpacked = SESSION_HEAD_STRUCT.unpack_from(data)
             return cls(
                 m_header=header,
                 m_weather=unpacked[0],
@@ -566,7 +553,7 @@ class PacketLapPositions:
 
         try:
             # Unpack header fields
-            num_laps, lap_start = struct.unpack(cls.LAP_POSITIONS_FORMAT, data[0:2])
+            num_laps, lap_start = LAP_POSITIONS_HEAD_STRUCT.unpack_from(data)
 
             packet = cls(
                 m_header=header,
@@ -574,22 +561,124 @@ class PacketLapPositions:
                 m_lapStart=lap_start
             )
 
-            # Read position data for each lap
-            offset = 2
-            for lap in range(min(num_laps, cls.MAX_LAPS_IN_PACKET)):
-                if offset + cls.NUM_CARS > len(data):
-                    logging.warning(f"Insufficient data for lap {lap} positions")
-                    break
+            # Read position data for each lap - bounds checked once, then one C-level pass
+            offset = LAP_POSITIONS_HEAD_STRUCT.size
+            num_laps = min(num_laps, cls.MAX_LAPS_IN_PACKET)
+            available_laps = min(num_laps, (len(data) - offset) // cls.NUM_CARS)
+            if available_laps < num_laps:
+                logging.warning(f"Insufficient data for lap {available_laps} positions")
 
-                lap_positions = list(struct.unpack(cls.POSITIONS_FORMAT, data[offset:offset+cls.NUM_CARS]))
-                packet.m_positionForVehicleIdx.append(lap_positions)
-                offset += cls.NUM_CARS
+            positions_bytes = memoryview(data)[offset:offset + available_laps * cls.NUM_CARS]
+            packet.m_positionForVehicleIdx = [list(lap_positions) for lap_positions in LAP_POSITIONS_STRUCT.iter_unpack(positions_bytes)]
 
             return packet
         except struct.error as e:
             logging.error(f"Failed to unpack PacketLapPositions: {e}")
             return None
 
+LAP_POSITIONS_HEAD_STRUCT = struct.Struct(PacketLapPositions.LAP_POSITIONS_FORMAT)
+LAP_POSITIONS_STRUCT = struct.Struct(PacketLapPositions.POSITIONS_FORMAT)
+
+# --- Packet Dispatch ---
+# Parser per packet ID, per packet format. Events carry no packet class and are handed
+# to the bridge unparsed; lap positions only exist in F1 25.
+PACKET_PARSERS_F124: Dict[int, Callable[[PacketHeader, bytes], Any]] = {
+    PACKET_ID_SESSION: PacketSessionData.from_bytes,
+    PACKET_ID_LAP_DATA: PacketLapData.from_bytes,
+    PACKET_ID_CAR_TELEMETRY: PacketCarTelemetry.from_bytes,
+    PACKET_ID_CAR_STATUS: PacketCarStatus.from_bytes,
+    PACKET_ID_CAR_DAMAGE: PacketCarDamage.from_bytes,
+}
+PACKET_PARSERS_F125: Dict[int, Callable[[PacketHeader, bytes], Any]] = {
+    **PACKET_PARSERS_F124,
+    PACKET_ID_LAP_POSITIONS: PacketLapPositions.from_bytes,
+}
+PACKET_PARSERS: Dict[int, Dict[int, Callable[[PacketHeader, bytes], Any]]] = {
+    2024: PACKET_PARSERS_F124,
+    2025: PACKET_PARSERS_F125,
+}
+
+# Packets the bridge has no use for - dropped without the "unhandled packet" debug log
+IGNORED_PACKET_IDS = frozenset({
+    PACKET_ID_MOTION, PACKET_ID_PARTICIPANTS,
+    PACKET_ID_CAR_SETUPS, PACKET_ID_FINAL_CLASSIFICATION, PACKET_ID_LOBBY_INFO,
+    PACKET_ID_SESSION_HISTORY, PACKET_ID_TYRE_SETS, PACKET_ID_MOTION_EX,
+    PACKET_ID_TIME_TRIAL
+})
+
+# --- Event Code Mapping (F1 24 Spec Page 7) ---
+# Descriptions for event codes worth reporting; BUTN (button status) is too noisy and never sent
+EVENT_DESCRIPTIONS = {
+    'SSTA': '🏁 Session Started',
+    'SEND': '🏁 Session Ended',
+    'FTLP': '⚡ Fastest Lap',
+    'RTMT': '❌ Driver Retirement',
+    'DRSE': '🟢 DRS Enabled by Race Control',
+    'DRSD': '🔴 DRS Disabled by Race Control',
+    'TMPT': '🔧 Team mate in pits',
+    'CHQF': '🏁 Chequered flag waved',
+    'RCWN': '🏆 Race Winner announced',
+    'PENA': '⚠️ Penalty Issued',
+    'SPTP': '📊 Speed Trap triggered',
+    'STLG': '🔴 Start lights',
+    'LGOT': '🟢 Lights out - Race start!',
+    'DTSV': '⚠️ Drive through penalty served',
+    'SGSV': '⚠️ Stop & Go penalty served',
+    'FLBK': '⏪ Flashback activated',
+    'RDFL': '🔴 RED FLAG shown',
+    'OVTK': '⏩ Overtake occurred',
+    'SCAR': '🚨 Safety Car deployed',
+    'COLL': '💥 Collision detected'
+}
+
+# Penalty type names for PENA events
+PENALTY_TYPES = {
+    0: "Drive through", 1: "Stop & Go", 2: "Grid penalty", 
+    3: "Penalty reminder", 4: "Time penalty", 5: "Warning",
+    6: "Disqualified", 7: "Removed from formation lap",
+    8: "Parked too long timer", 9: "Tyre regulations",
+    10: "This lap invalidated", 11: "This and next lap invalidated",
+    12: "This lap invalidated without reason", 13: "This and next lap invalidated without reason",
+    14: "This and previous lap invalidated", 15: "This and previous lap invalidated without reason",
+    16: "Retired", 17: "Black flag timer"
+}
+
+# Infringement type names for PENA events
+INFRINGEMENT_TYPES = {
+    0: "Blocking by slow driving", 1: "Blocking by wrong way driving",
+    2: "Reversing off the start line", 3: "Big Collision",
+    4: "Small Collision", 5: "Collision failed to hand back position single",
+    6: "Collision failed to hand back position multiple", 7: "Corner cutting gained time",
+    8: "Corner cutting overtake single", 9: "Corner cutting overtake multiple",
+    10: "Crossed pit exit lane", 11: "Ignoring blue flags",
+    12: "Ignoring yellow flags", 13: "Ignoring drive through",
+    14: "Too many drive throughs", 15: "Drive through reminder serve within n laps",
+    16: "Drive through reminder serve this lap", 17: "Pit lane speeding",
+    18: "Parked for too long", 19: "Ignoring tyre regulations",
+    20: "Too many penalties", 21: "Multiple warnings",
+    22: "Approaching disqualification", 23: "Tyre regulations select single",
+    24: "Tyre regulations select multiple", 25: "Lap invalidated corner cutting",
+    26: "Lap invalidated running wide", 27: "Corner cutting ran wide gained time minor",
+    28: "Corner cutting ran wide gained time significant", 29: "Corner cutting ran wide gained time extreme",
+    30: "Lap invalidated wall riding", 31: "Lap invalidated flashback used",
+    32: "Lap invalidated reset to track", 33: "Blocking the pitlane",
+    34: "Jump start", 35: "Safety car to car collision",
+    36: "Safety car illegal overtake", 37: "Safety car exceeding allowed pace",
+    38: "Virtual safety car exceeding allowed pace", 39: "Formation lap below allowed speed",
+    40: "Formation lap parking"
+}
+COLLISION_INFRINGEMENT_TYPES = frozenset({3, 4, 5, 6})  # Penalties that name the other car
+
+# The 4-byte event code read as a little-endian uint32, so button events can be dropped without decoding
+EVENT_CODE_STRUCT = struct.Struct("<I")
+EVENT_CODE_BUTTONS = int.from_bytes(b"BUTN", "little")
+
+# Event detail layouts, read with unpack_from straight after the 4-byte event code
+EVENT_DETAILS_OFFSET = 4
+EVENT_FASTEST_LAP_STRUCT = struct.Struct("<Bf")    # vehicleIdx, lapTime
+EVENT_PENALTY_STRUCT = struct.Struct("<BBBB")      # penaltyType, infringementType, vehicleIdx, otherVehicleIdx
+EVENT_VEHICLE_PAIR_STRUCT = struct.Struct("<BB")   # OVTK: overtaking, overtaken - COLL: vehicle 1, vehicle 2
+
 # --- Tyre Compound Mapping (Example - Check F1 24 Spec Appendix) ---
 # Based on F1 25/24 Spec Page 11 for m_actualTyreCompound
 TYRE_COMPOUND_MAP = {
@@ -602,6 +691,8 @@ TYRE_COMPOUND_MAP = {
     11: "F2 Super Soft", 12: "F2 Soft", 13: "F2 Medium", 14: "F2 Hard", 15: "F2 Wet",
 }
 DEFAULT_TYRE_COMPOUND = "Unknown"
+# Indexed directly by the uint8 compound ID - every value 0-255 has an entry, so no hashing or default lookup per payload
+TYRE_COMPOUND_BY_ID = tuple(TYRE_COMPOUND_MAP.get(i, DEFAULT_TYRE_COMPOUND) for i in range(256))
 
 # Map for m_visualTyreCompound (Page 11) - Use if needed for display only
 VISUAL_TYRE_COMPOUND_MAP = {
@@ -611,12 +702,14 @@ VISUAL_TYRE_COMPOUND_MAP = {
      # 19: "F2 Super Soft", 20: "F2 Soft", 21: "F2 Medium", 22: "F2 Hard", 15: "F2 Wet",
 }
 DEFAULT_VISUAL_TYRE_COMPOUND = "Unknown Visual"
+VISUAL_TYRE_COMPOUND_BY_ID = tuple(VISUAL_TYRE_COMPOUND_MAP.get(i, DEFAULT_VISUAL_TYRE_COMPOUND) for i in range(256))
 
 # ERS Deploy Mode Mapping (F1 24 Spec Page 11)
 ERS_DEPLOY_MODE_MAP = {
     0: "None", 1: "Medium", 2: "Hotlap", 3: "Overtake",
 }
 DEFAULT_ERS_MODE = "N/A"
+ERS_DEPLOY_MODE_BY_ID = tuple(ERS_DEPLOY_MODE_MAP.get(i, DEFAULT_ERS_MODE) for i in range(256))
 
 # Track ID Mapping (F1 24 Spec Appendix)
 TRACK_ID_MAP = {
@@ -652,7 +745,25 @@ class TelemetryBridge:
         self.session_id: str = str(uuid.uuid4())
 
         self.sock: Optional[socket.socket] = None
-        self.executor: concurrent.futures.ThreadPoolExecutor = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+        # Datagrams are received into one reused buffer; parsers copy out what they keep
+        self._recv_buf: bytearray = bytearray(PACKET_BUFFER_SIZE)
+        self._recv_view: memoryview = memoryview(self._recv_buf)
+        # Sends run on the executor only outside performance mode; there the HTTP sender thread posts instead
+        self.executor: Optional[concurrent.futures.ThreadPoolExecutor] = (
+            None if PERFORMANCE_MODE else concurrent.futures.ThreadPoolExecutor(max_workers=2))
+        # One HTTP session for every POST so the connection to the API is kept alive between sends
+        # (urllib3 already sets TCP_NODELAY on its sockets); one pooled connection per posting thread -
+        # the single HTTP sender thread, or the executor's two workers outside performance mode
+        self.http_session: requests.Session = requests.Session()
+        http_adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=1 if PERFORMANCE_MODE else 2,
+                                                      max_retries=0)
+        self.http_session.mount('http://', http_adapter)
+        self.http_session.mount('https://', http_adapter)
+        self.http_session.headers.update({
+            'Content-Type': 'application/json',
+            'User-Agent': f'{APP_NAME}/1.0',
+            'Accept': 'application/json'
+        })
         self.start_time: float = time.time()
         self.last_status_update_time: float = self.start_time
         self.last_send_time: float = self.start_time
@@ -664,7 +775,11 @@ class TelemetryBridge:
             self._last_debug_log: float = 0.0
             self._log_counter: int = 0
             self._status_log_counter: int = 0
-            self._async_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="HTTP-Async")
+            # Payloads waiting for the HTTP sender thread (started on first send); see _send_http_async
+            self._send_queue: Deque[Dict[str, Any]] = deque()
+            self._send_ready = threading.Condition()
+            self._sender_running: bool = True
+            self._sender_thread: Optional[threading.Thread] = None
 
         # State Data
         self.latest_lap_data: Optional[LapData] = None
@@ -674,6 +789,7 @@ class TelemetryBridge:
         self.latest_car_damage: Optional[CarDamageData] = None # Added state for damage
         self.latest_event: Optional[Dict[str, Any]] = None  # Store the latest event
         self.latest_header: Optional[PacketHeader] = None  # Store latest packet header for frame ID
+        self._state_changed: bool = False  # A handler has run since the last payload was prepared
 
         self.current_lap_num: int = 0
         self.lap_just_completed: bool = False
@@ -712,8 +828,33 @@ class TelemetryBridge:
         # Connection State
         self.connection_stats: Dict[str, float] = {"total_sent": 0, "total_failed": 0, "total_response_time": 0}
         self.send_retries: int = 0
+        self.invalid_lap_time_count: int = 0 # Payloads sent with an out-of-range current lap time
         self.current_send_interval: float = DEFAULT_SEND_INTERVAL_S
 
+        # Packet format -> packet ID -> (parser, handler); run() dispatches with one lookup
+        handlers = {
+            PACKET_ID_SESSION: self._handle_session,
+            PACKET_ID_LAP_DATA: self._handle_lap_data,
+            PACKET_ID_CAR_TELEMETRY: self._handle_telemetry,
+            PACKET_ID_CAR_STATUS: self._handle_car_status,
+            PACKET_ID_CAR_DAMAGE: self._handle_damage,
+            PACKET_ID_LAP_POSITIONS: self._handle_lap_positions,
+        }
+        self._packet_dispatch: Dict[int, Dict[int, Tuple[Callable, Callable]]] = {
+            packet_format: {packet_id: (parser, handlers[packet_id]) for packet_id, parser in parsers.items()}
+            for packet_format, parsers in PACKET_PARSERS.items()
+        }
+
+        # Event code -> detail handler; codes not listed are reported with their base description
+        self._event_handlers: Dict[str, Callable[[PacketHeader, bytes, Dict[str, Any]], Optional[str]]] = {
+            'SSTA': self._handle_session_started_event,
+            'SEND': self._handle_session_ended_event,
+            'FTLP': self._handle_fastest_lap_event,
+            'PENA': self._handle_penalty_event,
+            'OVTK': self._handle_overtake_event,
+            'COLL': self._handle_collision_event,
+        }
+
         self._setup_logging()
         logging.info(f"Initializing {APP_NAME}")
         if self.auto_detect_track:
@@ -732,13 +873,14 @@ class TelemetryBridge:
         logging.getLogger("urllib3").setLevel(logging.WARNING)
 
     def _init_aggregation(self) -> Dict[str, Dict[str, Any]]:
-        # Reset max values as well
+        # Running totals rather than per-packet sample lists: stats are computed on every
+        # send, so they must not depend on how far into the lap we are
         return {
-            "speed": {"values": [], "max": 0},
-            "throttle": {"values": [], "max": 0.0},
-            "brake": {"values": [], "max": 0.0},
-            "rpm": {"values": [], "max": 0},
-            "gear": {"values": [], "max": 0}
+            "speed": {"sum": 0, "count": 0, "max": 0},
+            "throttle": {"sum": 0.0, "count": 0, "max": 0.0},
+            "brake": {"sum": 0.0, "count": 0, "max": 0.0},
+            "rpm": {"sum": 0, "count": 0, "max": 0},
+            "gear": {"counts": [0] * GEAR_SLOTS, "count": 0, "max": 0}  # counts[gear]: samples in neutral (0) .. 8th
         }
 
     def _reset_lap_aggregates(self):
@@ -749,38 +891,35 @@ class TelemetryBridge:
     def _update_aggregation(self, telemetry: CarTelemetryData):
         if not telemetry: return
         agg = self.aggregated_data
-        agg["speed"]["values"].append(telemetry.m_speed)
-        agg["speed"]["max"] = max(agg["speed"]["max"], telemetry.m_speed)
-        # ... (rest of aggregation logic remains the same) ...
-        agg["throttle"]["values"].append(telemetry.m_throttle)
-        agg["throttle"]["max"] = max(agg["throttle"]["max"], telemetry.m_throttle)
-        agg["brake"]["values"].append(telemetry.m_brake)
-        agg["brake"]["max"] = max(agg["brake"]["max"], telemetry.m_brake)
-        agg["rpm"]["values"].append(telemetry.m_engineRPM)
-        agg["rpm"]["max"] = max(agg["rpm"]["max"], telemetry.m_engineRPM)
-        if telemetry.m_gear > 0:
-            agg["gear"]["values"].append(telemetry.m_gear)
-            agg["gear"]["max"] = max(agg["gear"]["max"], telemetry.m_gear)
-        elif telemetry.m_gear != -1:
-             agg["gear"]["values"].append(telemetry.m_gear)
+        for key, value in (("speed", telemetry.m_speed), ("throttle", telemetry.m_throttle),
+                           ("brake", telemetry.m_brake), ("rpm", telemetry.m_engineRPM)):
+            data = agg[key]
+            data["sum"] += value
+            data["count"] += 1
+            if value > data["max"]:
+                data["max"] = value
+        gear = telemetry.m_gear
+        if 0 <= gear < GEAR_SLOTS: # Reverse (-1) isn't counted
+            data = agg["gear"]
+            data["counts"][gear] += 1
+            data["count"] += 1
+            if gear > data["max"]:
+                data["max"] = gear
 
 
     def _calculate_lap_stats(self) -> Dict[str, Dict[str, Any]]:
-        # (Calculation logic remains the same)
         stats = {}
         for key, data in self.aggregated_data.items():
-            if data["values"]:
+            if data["count"]:
                 if key == "gear":
-                    gear_counts = {}
-                    for g in data["values"]:
-                        gear_counts[g] = gear_counts.get(g, 0) + 1
-                    most_used = max(gear_counts, key=gear_counts.get) if gear_counts else 0
+                    gear_counts = data["counts"]
+                    most_used = gear_counts.index(max(gear_counts))  # ties go to the lower gear
                     stats[key] = {"mostUsed": most_used, "max": data["max"]}
                 elif key in ["speed", "rpm"]:
-                    avg = round(sum(data["values"]) / len(data["values"]))
+                    avg = round(data["sum"] / data["count"])
                     stats[key] = {"average": avg, "max": data["max"]}
                 else:
-                    avg = sum(data["values"]) / len(data["values"])
+                    avg = data["sum"] / data["count"]
                     stats[key] = {"average": avg, "max": data["max"]}
             else:
                 stats[key] = {"average": 0 if key != "gear" else None, "mostUsed": 0 if key == "gear" else None, "max": data["max"]}
@@ -788,10 +927,17 @@ class TelemetryBridge:
 
     # --- Packet Handlers ---
 
+    def _player_slot(self, car_array):
+        """Returns the player's entry from a per-car array, or None if the player index isn't known or out of range."""
+        index = self.player_car_index
+        if car_array and 0 <= index < len(car_array):
+            return car_array[index]
+        return None
+
     def _handle_lap_data(self, packet: PacketLapData):
-        if not packet or not packet.m_lapData or self.player_car_index == -1 or self.player_car_index >= len(packet.m_lapData):
+        player_lap = self._player_slot(packet.m_lapData) if packet else None
+        if player_lap is None:
             return
-        player_lap = packet.m_lapData[self.player_car_index]
 
         # Check for lap completion *before* updating self.latest_lap_data
         if player_lap.m_currentLapNum > self.current_lap_num and self.current_lap_num > 0: # Avoid triggering on first lap
@@ -804,9 +950,9 @@ class TelemetryBridge:
         self.latest_lap_data = player_lap # Update state *after* checking completion
 
     def _handle_telemetry(self, packet: PacketCarTelemetry):
-        if not packet or not packet.m_carTelemetryData or self.player_car_index == -1 or self.player_car_index >= len(packet.m_carTelemetryData):
+        player_telemetry = self._player_slot(packet.m_carTelemetryData) if packet else None
+        if player_telemetry is None:
             return
-        player_telemetry = packet.m_carTelemetryData[self.player_car_index]
         self.latest_telemetry = player_telemetry
         self._update_aggregation(player_telemetry)
         # (Logging logic remains the same)
@@ -821,14 +967,15 @@ class TelemetryBridge:
 
 
     def _handle_car_status(self, packet: PacketCarStatus):
-        if not packet or not packet.m_carStatusData or self.player_car_index == -1 or self.player_car_index >= len(packet.m_carStatusData):
+        player_status = self._player_slot(packet.m_carStatusData) if packet else None
+        if player_status is None:
             return
-        self.latest_car_status = packet.m_carStatusData[self.player_car_index]
+        self.latest_car_status = player_status
         # (Logging logic remains the same, uses correct fields)
         if self.debug_mode and self.packets_received % 50 == 0:
             tyre_idx = self.latest_car_status.m_visualTyreCompound # Use visual for display usually
-            # Use VISUAL_TYRE_COMPOUND_MAP here for display consistency
-            tyre = VISUAL_TYRE_COMPOUND_MAP.get(tyre_idx, DEFAULT_VISUAL_TYRE_COMPOUND)
+            # Use the visual compound names here for display consistency
+            tyre = VISUAL_TYRE_COMPOUND_BY_ID[tyre_idx]
             ers_joules = self.latest_car_status.m_ersStoreEnergy
             ers_max_joules = 4000000 # Constant for F1 cars
             ers_perc = (ers_joules / ers_max_joules * 100) if ers_max_joules > 0 else 0 # Avoid division by zero
@@ -843,229 +990,174 @@ class TelemetryBridge:
             return
             
         try:
-            event_code = data[:4].decode('utf-8', errors='ignore')
-            
-            # Map event codes to descriptive messages - skip unimportant events
-            event_descriptions = {
-                'SSTA': '🏁 Session Started',
-                'SEND': '🏁 Session Ended',
-                'FTLP': '⚡ Fastest Lap',
-                'RTMT': '❌ Driver Retirement',
-                'DRSE': '🟢 DRS Enabled by Race Control',
-                'DRSD': '🔴 DRS Disabled by Race Control',
-                'TMPT': '🔧 Team mate in pits',
-                'CHQF': '🏁 Chequered flag waved',
-                'RCWN': '🏆 Race Winner announced',
-                'PENA': '⚠️ Penalty Issued',
-                'SPTP': '📊 Speed Trap triggered',
-                'STLG': '🔴 Start lights',
-                'LGOT': '🟢 Lights out - Race start!',
-                'DTSV': '⚠️ Drive through penalty served',
-                'SGSV': '⚠️ Stop & Go penalty served',
-                'FLBK': '⏪ Flashback activated',
-                # 'BUTN': '🎮 Button status changed', # Removed - too noisy
-                'RDFL': '🔴 RED FLAG shown',
-                'OVTK': '⏩ Overtake occurred',
-                'SCAR': '🚨 Safety Car deployed',
-                'COLL': '💥 Collision detected'
-            }
-            
-            # Skip processing BUTN events completely
-            if event_code == 'BUTN':
+            # Skip processing BUTN events completely - about half of all events, sent on every button press
+            if EVENT_CODE_STRUCT.unpack_from(data)[0] == EVENT_CODE_BUTTONS:
                 return
+
+            event_code = str(data[:4], 'utf-8', errors='ignore')  # data may be a memoryview
                 
             # Get the human-readable description or use the code if not found
-            base_description = event_descriptions.get(event_code, f'Event: {event_code}')
-            
-            # Enhanced detail description
-            detailed_description = base_description
+            base_description = EVENT_DESCRIPTIONS.get(event_code, f'Event: {event_code}')
             event_data = {}
             
             # Special handling for specific events with more details
-            if event_code == 'SSTA':
-                # Session started - COMPLETELY reset all state
-                logging.info("🏁 New session started - resetting all telemetry data")
-                self._reset_lap_aggregates()
-                self.current_lap_num = 0
-                self.last_lap_time_ms = 0
-                self.lap_just_completed = False
-                
-                # Clear all cached telemetry data to ensure clean state
-                self.latest_lap_data = None
-                self.latest_telemetry = None
-                self.latest_car_status = None
-                self.latest_car_damage = None
-                
-            elif event_code == 'SEND':
-                # Session ended
-                logging.info("🏁 Session ended - finalizing telemetry")
-                
-            elif event_code == 'FTLP':
-                # Try to parse fastest lap details if available
-                if len(data) >= 8:  # Ensure we have enough data for vehicle index + lap time
-                    try:
-                        # Extract vehicle index and lap time
-                        vehicle_idx = data[4]
-                        # Unpack the lap time as a float (4 bytes starting at position 5)
-                        lap_time_bytes = data[5:9]
-                        if len(lap_time_bytes) == 4:
-                            lap_time = struct.unpack('<f', lap_time_bytes)[0]
-                            lap_time_str = f"{lap_time:.3f}s"
-                            
-                            # Store for payload
-                            event_data['lapTime'] = lap_time
-                            event_data['vehicleIdx'] = vehicle_idx
-                            
-                            if vehicle_idx == header.m_playerCarIndex:
-                                detailed_description = f"⚡ YOU just set the FASTEST LAP of the session! ({lap_time_str})"
-                                logging.info(detailed_description)
-                            else:
-                                detailed_description = f"⚡ Car #{vehicle_idx} set the fastest lap of the session: {lap_time_str}"
-                                logging.info(detailed_description)
-                        else:
-                            logging.debug(f"Insufficient data for lap time unpacking: {len(lap_time_bytes)} bytes")
-                    except Exception as e:
-                        logging.debug(f"Error parsing FTLP event details: {e}")
-                        
-            elif event_code == 'PENA':
-                # Try to extract penalty details
-                if len(data) >= 11:  # Need at least 7 bytes after the event code
-                    try:
-                        penalty_type = data[4]
-                        infringement_type = data[5]
-                        vehicle_idx = data[6]
-                        other_vehicle_idx = data[7]
-                        
-                        # Define penalty type names
-                        penalty_types = {
-                            0: "Drive through", 1: "Stop & Go", 2: "Grid penalty", 
-                            3: "Penalty reminder", 4: "Time penalty", 5: "Warning",
-                            6: "Disqualified", 7: "Removed from formation lap",
-                            8: "Parked too long timer", 9: "Tyre regulations",
-                            10: "This lap invalidated", 11: "This and next lap invalidated",
-                            12: "This lap invalidated without reason", 13: "This and next lap invalidated without reason",
-                            14: "This and previous lap invalidated", 15: "This and previous lap invalidated without reason",
-                            16: "Retired", 17: "Black flag timer"
-                        }
-                        
-                        # Define infringement type names
-                        infringement_types = {
-                            0: "Blocking by slow driving", 1: "Blocking by wrong way driving",
-                            2: "Reversing off the start line", 3: "Big Collision",
-                            4: "Small Collision", 5: "Collision failed to hand back position single",
-                            6: "Collision failed to hand back position multiple", 7: "Corner cutting gained time",
-                            8: "Corner cutting overtake single", 9: "Corner cutting overtake multiple",
-                            10: "Crossed pit exit lane", 11: "Ignoring blue flags",
-                            12: "Ignoring yellow flags", 13: "Ignoring drive through",
-                            14: "Too many drive throughs", 15: "Drive through reminder serve within n laps",
-                            16: "Drive through reminder serve this lap", 17: "Pit lane speeding",
-                            18: "Parked for too long", 19: "Ignoring tyre regulations",
-                            20: "Too many penalties", 21: "Multiple warnings",
-                            22: "Approaching disqualification", 23: "Tyre regulations select single",
-                            24: "Tyre regulations select multiple", 25: "Lap invalidated corner cutting",
-                            26: "Lap invalidated running wide", 27: "Corner cutting ran wide gained time minor",
-                            28: "Corner cutting ran wide gained time significant", 29: "Corner cutting ran wide gained time extreme",
-                            30: "Lap invalidated wall riding", 31: "Lap invalidated flashback used",
-                            32: "Lap invalidated reset to track", 33: "Blocking the pitlane",
-                            34: "Jump start", 35: "Safety car to car collision",
-                            36: "Safety car illegal overtake", 37: "Safety car exceeding allowed pace",
-                            38: "Virtual safety car exceeding allowed pace", 39: "Formation lap below allowed speed",
-                            40: "Formation lap parking"
-                        }
-                        
-                        # Get penalty and infringement descriptions
-                        penalty_desc = penalty_types.get(penalty_type, f"Unknown penalty ({penalty_type})")
-                        infringement_desc = infringement_types.get(infringement_type, f"Unknown infringement ({infringement_type})")
-                        
-                        # Store for payload
-                        event_data['penaltyType'] = penalty_type
-                        event_data['infringementType'] = infringement_type
-                        event_data['vehicleIdx'] = vehicle_idx
-                        event_data['otherVehicleIdx'] = other_vehicle_idx
-                        
-                        # Create detailed description
-                        if vehicle_idx == header.m_playerCarIndex:
-                            detailed_description = f"⚠️ YOU received a {penalty_desc} penalty for {infringement_desc}"
-                        else:
-                            detailed_description = f"⚠️ Car #{vehicle_idx} received a {penalty_desc} penalty for {infringement_desc}"
-                            
-                        if other_vehicle_idx != 255 and infringement_type in [3, 4, 5, 6]:  # Collision penalties
-                            detailed_description += f" with Car #{other_vehicle_idx}"
-                            
-                        logging.info(detailed_description)
-                    except Exception as e:
-                        logging.debug(f"Error parsing PENA event details: {e}")
-                        
-            elif event_code == 'OVTK':
-                # Try to extract overtake details
-                if len(data) >= 6:  # Need at least 2 bytes after the event code
-                    try:
-                        overtaking_idx = data[4]
-                        overtaken_idx = data[5]
-                        
-                        # Store for payload
-                        event_data['overtakingVehicleIdx'] = overtaking_idx
-                        event_data['overtakenVehicleIdx'] = overtaken_idx
-                        
-                        # Create detailed description
-                        if overtaking_idx == header.m_playerCarIndex:
-                            detailed_description = f"⏩ YOU overtook Car #{overtaken_idx}!"
-                        elif overtaken_idx == header.m_playerCarIndex:
-                            detailed_description = f"⏩ Car #{overtaking_idx} overtook YOU!"
-                        else:
-                            detailed_description = f"⏩ Car #{overtaking_idx} overtook Car #{overtaken_idx}"
-                            
-                        logging.info(detailed_description)
-                    except Exception as e:
-                        logging.debug(f"Error parsing OVTK event details: {e}")
-                        
-            elif event_code == 'COLL':
-                # Try to extract collision details
-                if len(data) >= 6:  # Need at least 2 bytes after the event code
-                    try:
-                        vehicle1_idx = data[4]
-                        vehicle2_idx = data[5]
-                        
-                        # Store for payload
-                        event_data['vehicle1Idx'] = vehicle1_idx
-                        event_data['vehicle2Idx'] = vehicle2_idx
-                        
-                        # Create detailed description
-                        if vehicle1_idx == header.m_playerCarIndex:
-                            detailed_description = f"💥 YOU collided with Car #{vehicle2_idx}!"
-                        elif vehicle2_idx == header.m_playerCarIndex:
-                            detailed_description = f"💥 Car #{vehicle1_idx} collided with YOU!"
-                        else:
-                            detailed_description = f"💥 Car #{vehicle1_idx} collided with Car #{vehicle2_idx}"
-                            
-                        logging.info(detailed_description)
-                    except Exception as e:
-                        logging.debug(f"Error parsing COLL event details: {e}")
+            handler = self._event_handlers.get(event_code)
+            if handler is not None:
+                # Handlers fill event_data and return an enhanced description, if they have one
+                detailed_description = handler(header, data, event_data) or base_description
             else:
                 # Log the basic event
+                detailed_description = base_description
                 logging.info(f"EVENT: {base_description}")
             
-            # Skip sending BUTN events entirely
-            if event_code != 'BUTN':
-                # Include the event in the next telemetry payload with enhanced data
-                event_payload = {
-                    'code': event_code,
-                    'description': detailed_description,
-                    'timestamp': datetime.datetime.now().isoformat(),
-                    'data': event_data  # Include the parsed event data
-                }
-                
-                # Store the event for inclusion in the next payload
-                self.latest_event = event_payload
+            # Include the event in the next telemetry payload with enhanced data
+            event_payload = {
+                'code': event_code,
+                'description': detailed_description,
+                'timestamp': datetime.datetime.now().isoformat(),
+                'data': event_data  # Include the parsed event data
+            }
+            
+            # Store the event for inclusion in the next payload
+            self.latest_event = event_payload
                 
         except Exception as e:
             logging.warning(f"Error processing event packet: {e}")
 
+    def _handle_session_started_event(self, header: PacketHeader, data: bytes, event_data: Dict[str, Any]) -> Optional[str]:
+        # Session started - COMPLETELY reset all state
+        logging.info("🏁 New session started - resetting all telemetry data")
+        self._reset_lap_aggregates()
+        self.current_lap_num = 0
+        self.last_lap_time_ms = 0
+        self.lap_just_completed = False
+        
+        # Clear all cached telemetry data to ensure clean state
+        self.latest_lap_data = None
+        self.latest_telemetry = None
+        self.latest_car_status = None
+        self.latest_car_damage = None
+        return None
+
+    def _handle_session_ended_event(self, header: PacketHeader, data: bytes, event_data: Dict[str, Any]) -> Optional[str]:
+        # Session ended
+        logging.info("🏁 Session ended - finalizing telemetry")
+        return None
+
+    def _handle_fastest_lap_event(self, header: PacketHeader, data: bytes, event_data: Dict[str, Any]) -> Optional[str]:
+        # Try to parse fastest lap details if available
+        if len(data) < 8:  # Ensure we have enough data for vehicle index + lap time
+            return None
+        try:
+            # The lap time is a float following the vehicle index
+            if len(data) < EVENT_DETAILS_OFFSET + EVENT_FASTEST_LAP_STRUCT.size:
+                logging.debug(f"Insufficient data for lap time unpacking: {len(data) - EVENT_DETAILS_OFFSET - 1} bytes")
+                return None
+            vehicle_idx, lap_time = EVENT_FASTEST_LAP_STRUCT.unpack_from(data, EVENT_DETAILS_OFFSET)
+            lap_time_str = f"{lap_time:.3f}s"
+            
+            # Store for payload
+            event_data['lapTime'] = lap_time
+            event_data['vehicleIdx'] = vehicle_idx
+            
+            if vehicle_idx == header.m_playerCarIndex:
+                detailed_description = f"⚡ YOU just set the FASTEST LAP of the session! ({lap_time_str})"
+            else:
+                detailed_description = f"⚡ Car #{vehicle_idx} set the fastest lap of the session: {lap_time_str}"
+            logging.info(detailed_description)
+            return detailed_description
+        except Exception as e:
+            logging.debug(f"Error parsing FTLP event details: {e}")
+            return None
+
+    def _handle_penalty_event(self, header: PacketHeader, data: bytes, event_data: Dict[str, Any]) -> Optional[str]:
+        # Try to extract penalty details
+        if len(data) < 11:  # Need at least 7 bytes after the event code
+            return None
+        try:
+            penalty_type, infringement_type, vehicle_idx, other_vehicle_idx = EVENT_PENALTY_STRUCT.unpack_from(data, EVENT_DETAILS_OFFSET)
+            
+            # Get penalty and infringement descriptions
+            penalty_desc = PENALTY_TYPES.get(penalty_type, f"Unknown penalty ({penalty_type})")
+            infringement_desc = INFRINGEMENT_TYPES.get(infringement_type, f"Unknown infringement ({infringement_type})")
+            
+            # Store for payload
+            event_data['penaltyType'] = penalty_type
+            event_data['infringementType'] = infringement_type
+            event_data['vehicleIdx'] = vehicle_idx
+            event_data['otherVehicleIdx'] = other_vehicle_idx
+            
+            # Create detailed description
+            if vehicle_idx == header.m_playerCarIndex:
+                detailed_description = f"⚠️ YOU received a {penalty_desc} penalty for {infringement_desc}"
+            else:
+                detailed_description = f"⚠️ Car #{vehicle_idx} received a {penalty_desc} penalty for {infringement_desc}"
+                
+            if other_vehicle_idx != 255 and infringement_type in COLLISION_INFRINGEMENT_TYPES:
+                detailed_description += f" with Car #{other_vehicle_idx}"
+                
+            logging.info(detailed_description)
+            return detailed_description
+        except Exception as e:
+            logging.debug(f"Error parsing PENA event details: {e}")
+            return None
+
+    def _handle_overtake_event(self, header: PacketHeader, data: bytes, event_data: Dict[str, Any]) -> Optional[str]:
+        # Try to extract overtake details
+        if len(data) < 6:  # Need at least 2 bytes after the event code
+            return None
+        try:
+            overtaking_idx, overtaken_idx = EVENT_VEHICLE_PAIR_STRUCT.unpack_from(data, EVENT_DETAILS_OFFSET)
+            
+            # Store for payload
+            event_data['overtakingVehicleIdx'] = overtaking_idx
+            event_data['overtakenVehicleIdx'] = overtaken_idx
+            
+            # Create detailed description
+            if overtaking_idx == header.m_playerCarIndex:
+                detailed_description = f"⏩ YOU overtook Car #{overtaken_idx}!"
+            elif overtaken_idx == header.m_playerCarIndex:
+                detailed_description = f"⏩ Car #{overtaking_idx} overtook YOU!"
+            else:
+                detailed_description = f"⏩ Car #{overtaking_idx} overtook Car #{overtaken_idx}"
+                
+            logging.info(detailed_description)
+            return detailed_description
+        except Exception as e:
+            logging.debug(f"Error parsing OVTK event details: {e}")
+            return None
+
+    def _handle_collision_event(self, header: PacketHeader, data: bytes, event_data: Dict[str, Any]) -> Optional[str]:
+        # Try to extract collision details
+        if len(data) < 6:  # Need at least 2 bytes after the event code
+            return None
+        try:
+            vehicle1_idx, vehicle2_idx = EVENT_VEHICLE_PAIR_STRUCT.unpack_from(data, EVENT_DETAILS_OFFSET)
+            
+            # Store for payload
+            event_data['vehicle1Idx'] = vehicle1_idx
+            event_data['vehicle2Idx'] = vehicle2_idx
+            
+            # Create detailed description
+            if vehicle1_idx == header.m_playerCarIndex:
+                detailed_description = f"💥 YOU collided with Car #{vehicle2_idx}!"
+            elif vehicle2_idx == header.m_playerCarIndex:
+                detailed_description = f"💥 Car #{vehicle1_idx} collided with YOU!"
+            else:
+                detailed_description = f"💥 Car #{vehicle1_idx} collided with Car #{vehicle2_idx}"
+                
+            logging.info(detailed_description)
+            return detailed_description
+        except Exception as e:
+            logging.debug(f"Error parsing COLL event details: {e}")
+            return None
+
     def _handle_damage(self, packet: PacketCarDamage): # Changed signature to accept parsed packet
         """Handles incoming Car Damage packet."""
-        if not packet or not packet.m_carDamageData or self.player_car_index == -1 or self.player_car_index >= len(packet.m_carDamageData):
+        player_damage = self._player_slot(packet.m_carDamageData) if packet else None
+        if player_damage is None:
              return
-        self.latest_car_damage = packet.m_carDamageData[self.player_car_index]
+        self.latest_car_damage = player_damage
 
         if self.debug_mode and self.packets_received % 30 == 0: # Log damage periodically
             dmg = self.latest_car_damage
@@ -1111,17 +1203,18 @@ class TelemetryBridge:
         # Always send a payload with whatever data we have - don't require complete data
         # This ensures dashboard gets updates even when some packet types are missing
 
-        # Calculate stats just before sending
+        # Calculate stats just before sending - every stat key is always present (see _calculate_lap_stats)
         lap_stats = self._calculate_lap_stats()
 
         now_iso = datetime.datetime.utcnow().isoformat() + "Z"
         
         # Send minimal payload if no data available yet
         if not self.latest_telemetry and not self.latest_lap_data:
-            logging.debug(f"Sending minimal payload - no telemetry or lap data available yet. "
-                         f"latest_telemetry={self.latest_telemetry is not None}, "
-                         f"latest_lap_data={self.latest_lap_data is not None}, "
-                         f"player_car_index={self.player_car_index}")
+            if self.debug_mode:
+                logging.debug(f"Sending minimal payload - no telemetry or lap data available yet. "
+                             f"latest_telemetry={self.latest_telemetry is not None}, "
+                             f"latest_lap_data={self.latest_lap_data is not None}, "
+                             f"player_car_index={self.player_car_index}")
             return {
                 "timestamp": now_iso,
                 "sessionId": self.session_id,
@@ -1131,10 +1224,10 @@ class TelemetryBridge:
                 "connectionStatus": "waiting_for_data"
             }
         
-        logging.debug(f"Preparing full payload with telemetry={self.latest_telemetry is not None}, "
-                     f"lap_data={self.latest_lap_data is not None}")
+        if self.debug_mode:
+            logging.debug(f"Preparing full payload with telemetry={self.latest_telemetry is not None}, "
+                         f"lap_data={self.latest_lap_data is not None}")
         is_lap_complete = self.lap_just_completed
-        final_lap_time_sec = (self.last_lap_time_ms / 1000.0) if is_lap_complete and self.last_lap_time_ms > 0 else None
 
         # Extract current values safely
         current_telemetry = self.latest_telemetry
@@ -1142,26 +1235,6 @@ class TelemetryBridge:
         current_status = self.latest_car_status
         current_damage = self.latest_car_damage
 
-        # Map tyre and ERS mode indices to strings
-        tyre_compound_str = TYRE_COMPOUND_MAP.get(current_status.m_actualTyreCompound, DEFAULT_TYRE_COMPOUND)
-        ers_mode_str = ERS_DEPLOY_MODE_MAP.get(current_status.m_ersDeployMode, DEFAULT_ERS_MODE)
-
-        # Format tyre wear from CarDamageData (Indices: 0=RL, 1=RR, 2=FL, 3=FR)
-        tyre_wear_payload = {
-            "frontLeft": current_damage.m_tyresWear[2] / 100.0 if len(current_damage.m_tyresWear) > 2 and current_damage.m_tyresWear[2] is not None else None,
-            "frontRight": current_damage.m_tyresWear[3] / 100.0 if len(current_damage.m_tyresWear) > 3 and current_damage.m_tyresWear[3] is not None else None,
-            "rearLeft": current_damage.m_tyresWear[0] / 100.0 if len(current_damage.m_tyresWear) > 0 and current_damage.m_tyresWear[0] is not None else None,
-            "rearRight": current_damage.m_tyresWear[1] / 100.0 if len(current_damage.m_tyresWear) > 1 and current_damage.m_tyresWear[1] is not None else None,
-        }
-
-        # Add brake temp from CarTelemetryData (Indices: 0=RL, 1=RR, 2=FL, 3=FR)
-        brake_temp_payload = {
-            "frontLeft": current_telemetry.m_brakesTemperature[2] if len(current_telemetry.m_brakesTemperature) > 2 else None,
-            "frontRight": current_telemetry.m_brakesTemperature[3] if len(current_telemetry.m_brakesTemperature) > 3 else None,
-            "rearLeft": current_telemetry.m_brakesTemperature[0] if len(current_telemetry.m_brakesTemperature) > 0 else None,
-            "rearRight": current_telemetry.m_brakesTemperature[1] if len(current_telemetry.m_brakesTemperature) > 1 else None,
-        }
-
         # Generate primary keys for Data Cloud
         frame_id = header.m_frameIdentifier if header else int(time.time()*1000)
         telemetry_id = f"{self.session_id}-{frame_id}-{int(time.time()*1000)}"
@@ -1171,19 +1244,25 @@ class TelemetryBridge:
         current_lap_time_ms = current_lap.m_currentLapTimeInMS
         last_lap_time_ms = self.last_lap_time_ms if is_lap_complete else None
         
-        # Validate current lap time (0 to 600 seconds)
-        if current_lap_time_ms > 600000:  # More than 10 minutes
-            logging.warning(f"Invalid current lap time received: {current_lap_time_ms}ms ({current_lap_time_ms/1000.0:.3f}s)")
+        # Validate current lap time (0 to 600 seconds) - compared in ms, only valid times are converted
+        if current_lap_time_ms > MAX_LAP_TIME_MS:
+            # Stays invalid for every send while the lap timer runs on (e.g. sitting in the garage), so warn sparingly
+            self.invalid_lap_time_count += 1
+            if self.invalid_lap_time_count % 500 == 1:
+                logging.warning(f"Invalid current lap time received: {current_lap_time_ms}ms "
+                                f"({self.invalid_lap_time_count} invalid so far)")
             current_lap_time_seconds = 0  # Reset to 0 if invalid
         else:
             current_lap_time_seconds = current_lap_time_ms / 1000.0
         
         # Validate last lap time (0 to 600 seconds)  
-        if last_lap_time_ms and last_lap_time_ms > 600000:  # More than 10 minutes
-            logging.warning(f"Invalid last lap time received: {last_lap_time_ms}ms ({last_lap_time_ms/1000.0:.3f}s)")
+        if not last_lap_time_ms:
+            final_lap_time_sec = None
+        elif last_lap_time_ms > MAX_LAP_TIME_MS:
+            logging.warning(f"Invalid last lap time received: {last_lap_time_ms}ms")
             final_lap_time_sec = None  # Reset to None if invalid
         else:
-            final_lap_time_sec = last_lap_time_ms / 1000.0 if last_lap_time_ms else None
+            final_lap_time_sec = last_lap_time_ms / 1000.0
 
         # Construct the main payload dictionary with all essential data
         payload = {
@@ -1212,33 +1291,33 @@ class TelemetryBridge:
             "currentLapInvalid": current_lap.m_currentLapInvalid,
             "speed": {
                 "current": current_telemetry.m_speed,
-                "average": lap_stats.get("speed", {}).get("average"),
-                "max": lap_stats.get("speed", {}).get("max", 0)
+                "average": lap_stats["speed"]["average"],
+                "max": lap_stats["speed"]["max"]
             },
             "throttle": {
                 "current": current_telemetry.m_throttle,
-                "average": lap_stats.get("throttle", {}).get("average"),
-                "max": lap_stats.get("throttle", {}).get("max", 0.0)
+                "average": lap_stats["throttle"]["average"],
+                "max": lap_stats["throttle"]["max"]
             },
             "brake": {
                 "current": current_telemetry.m_brake,
-                "average": lap_stats.get("brake", {}).get("average"),
-                "max": lap_stats.get("brake", {}).get("max", 0.0)
+                "average": lap_stats["brake"]["average"],
+                "max": lap_stats["brake"]["max"]
             },
             # Add steering data explicitly for steering wheel display
             "steer": {
-                "current": current_telemetry.m_steer if hasattr(current_telemetry, 'm_steer') else 0.0,
+                "current": current_telemetry.m_steer,
                 "average": 0.0, # We don't track average steering
             },
             "gear": {
                 "current": current_telemetry.m_gear,
-                "mostUsed": lap_stats.get("gear", {}).get("mostUsed"),
-                "max": lap_stats.get("gear", {}).get("max", 0)
+                "mostUsed": lap_stats["gear"]["mostUsed"],
+                "max": lap_stats["gear"]["max"]
             },
             "engineRPM": {
                 "current": current_telemetry.m_engineRPM,
-                "average": lap_stats.get("rpm", {}).get("average"),
-                "max": lap_stats.get("rpm", {}).get("max", 0)
+                "average": lap_stats["rpm"]["average"],
+                "max": lap_stats["rpm"]["max"]
             },
             "drsActive": current_telemetry.m_drs == 1,
             
@@ -1253,8 +1332,8 @@ class TelemetryBridge:
         # Add optional data if available - status data
         if self.latest_car_status:
             current_status = self.latest_car_status
-            ers_mode_str = ERS_DEPLOY_MODE_MAP.get(current_status.m_ersDeployMode, DEFAULT_ERS_MODE)
-            tyre_compound_str = TYRE_COMPOUND_MAP.get(current_status.m_actualTyreCompound, DEFAULT_TYRE_COMPOUND)
+            ers_mode_str = ERS_DEPLOY_MODE_BY_ID[current_status.m_ersDeployMode]
+            tyre_compound_str = TYRE_COMPOUND_BY_ID[current_status.m_actualTyreCompound]
             
             # Add car status data
             payload.update({
@@ -1263,7 +1342,7 @@ class TelemetryBridge:
                 "ersStoreEnergy": current_status.m_ersStoreEnergy,
                 "tyreCompound": tyre_compound_str,
                 "fuelInTank": current_status.m_fuelInTank,
-                "fuelRemainingLaps": current_status.m_fuelRemainingLaps if hasattr(current_status, 'm_fuelRemainingLaps') else 0,
+                "fuelRemainingLaps": current_status.m_fuelRemainingLaps,
                 "vehicleFiaFlags": current_status.m_vehicleFiaFlags, # For flag status
             })
         
@@ -1271,20 +1350,23 @@ class TelemetryBridge:
         if self.latest_car_damage and self.latest_telemetry:
             current_damage = self.latest_car_damage
             
+            # Per-wheel arrays are always 4 long (0=RL, 1=RR, 2=FL, 3=FR)
             # Extract tyre wear data
+            tyres_wear = current_damage.m_tyresWear
             tyre_wear_payload = {
-                "frontLeft": current_damage.m_tyresWear[2] / 100.0 if len(current_damage.m_tyresWear) > 2 else 0.0,
-                "frontRight": current_damage.m_tyresWear[3] / 100.0 if len(current_damage.m_tyresWear) > 3 else 0.0,
-                "rearLeft": current_damage.m_tyresWear[0] / 100.0 if len(current_damage.m_tyresWear) > 0 else 0.0,
-                "rearRight": current_damage.m_tyresWear[1] / 100.0 if len(current_damage.m_tyresWear) > 1 else 0.0,
+                "frontLeft": tyres_wear[2] / 100.0,
+                "frontRight": tyres_wear[3] / 100.0,
+                "rearLeft": tyres_wear[0] / 100.0,
+                "rearRight": tyres_wear[1] / 100.0,
             }
             
             # Extract brake temps
+            brakes_temperature = current_telemetry.m_brakesTemperature
             brake_temp_payload = {
-                "frontLeft": current_telemetry.m_brakesTemperature[2] if len(current_telemetry.m_brakesTemperature) > 2 else 0,
-                "frontRight": current_telemetry.m_brakesTemperature[3] if len(current_telemetry.m_brakesTemperature) > 3 else 0,
-                "rearLeft": current_telemetry.m_brakesTemperature[0] if len(current_telemetry.m_brakesTemperature) > 0 else 0,
-                "rearRight": current_telemetry.m_brakesTemperature[1] if len(current_telemetry.m_brakesTemperature) > 1 else 0,
+                "frontLeft": brakes_temperature[2],
+                "frontRight": brakes_temperature[3],
+                "rearLeft": brakes_temperature[0],
+                "rearRight": brakes_temperature[1],
             }
             
             payload.update({
@@ -1328,35 +1410,79 @@ class TelemetryBridge:
                     logging.error(f"Payload contains non-serializable data: {e}")
 
         # Use async sending if performance mode is enabled
-        if PERFORMANCE_MODE and hasattr(self, '_async_executor'):
+        if PERFORMANCE_MODE and hasattr(self, '_send_queue'):
             self._send_http_async(payload)
-        else:
-            self._send_http_sync(payload)
+            # The lap-completed payload is queued and never coalesced away, so the next lap starts
+            # now, on the receive thread that also updates the aggregates - not when the POST returns
+            if payload.get("lapCompleted"):
+                self._start_next_lap_aggregates()
+        elif self._send_http_sync(payload) and payload.get("lapCompleted"):
+            # Reset aggregation ONLY after successful send of a completed lap payload
+            self._start_next_lap_aggregates()
+
+    def _start_next_lap_aggregates(self):
+        """Clears the lap stats and the lap-completed flag once the completed lap's payload is handed off."""
+        logging.info(f"Resetting aggregation data for new lap ({self.current_lap_num}).")
+        self._reset_lap_aggregates()
+        self.lap_just_completed = False # Reset flag after processing
 
     def _send_http_async(self, payload: Dict[str, Any]):
-        """Send HTTP request asynchronously to prevent blocking UDP processing"""
-        future = self._async_executor.submit(self._send_http_sync, payload)
-        future.add_done_callback(self._handle_async_send_result)
-
-    def _handle_async_send_result(self, future):
-        """Handle the result of async HTTP send"""
-        try:
-            future.result()  # This will raise any exception that occurred
-        except Exception as e:
-            logging.error(f"Async HTTP send failed: {e}")
+        """Send HTTP request asynchronously to prevent blocking UDP processing.
+
+        Payloads are produced every send tick whether or not the last POST has
+        finished, so a queued payload that hasn't gone out yet is replaced by the
+        newer one - the dashboard only needs the latest state. Payloads carrying an
+        event (session start/end, fastest lap, ...) or completing a lap are never replaced.
+        """
+        with self._send_ready:
+            tail = self._send_queue[-1] if self._send_queue else None
+            if tail is not None and tail.get("event") is None and not tail.get("lapCompleted"):
+                self._send_queue[-1] = payload
+            else:
+                self._send_queue.append(payload)
+                self._send_ready.notify()
+            if self._sender_thread is None:
+                self._sender_thread = threading.Thread(target=self._sender_loop, name="HTTP-Sender", daemon=True)
+                self._sender_thread.start()
+
+    def _sender_loop(self):
+        """HTTP sender thread: posts queued payloads in order, sleeping until there is one to send.
+
+        On shutdown it drains what's left in the queue before exiting. A lap-completed
+        payload whose POST fails goes back to the front of the queue, up to
+        MAX_SEND_RETRIES times, since the lap stats have already been reset for the next lap.
+        """
+        lap_retries = 0
+        while True:
+            with self._send_ready:
+                while not self._send_queue:
+                    if not self._sender_running:
+                        return
+                    self._send_ready.wait()
+                payload = self._send_queue.popleft()
+            try:
+                sent = self._send_http_sync(payload)
+            except Exception as e:
+                logging.error(f"Async HTTP send failed: {e}")
+                sent = False
+            if sent or not payload.get("lapCompleted"):
+                lap_retries = 0
+            elif lap_retries < MAX_SEND_RETRIES:
+                lap_retries += 1
+                logging.warning(f"Retrying lap {payload.get('lapNumber', '?')} payload ({lap_retries}/{MAX_SEND_RETRIES})")
+                with self._send_ready:
+                    self._send_queue.appendleft(payload)
+                time.sleep(self.current_send_interval)
+            else:
+                logging.error(f"Dropping lap {payload.get('lapNumber', '?')} payload after {MAX_SEND_RETRIES} retries")
+                lap_retries = 0
 
-    def _send_http_sync(self, payload: Dict[str, Any]):
-        """Synchronous HTTP send implementation"""
-        headers = {
-            'Content-Type': 'application/json',
-            'User-Agent': f'{APP_NAME}/1.0',
-            'Accept': 'application/json'
-        }
+    def _send_http_sync(self, payload: Dict[str, Any]) -> bool:
+        """Synchronous HTTP send implementation. Returns True if the API accepted the payload."""
         start_req_time = time.monotonic()
 
         try:
-            with requests.Session() as session:
-                response = session.post(self.api_url, json=payload, headers=headers, timeout=10.0)
+            response = self.http_session.post(self.api_url, data=encode_payload(payload), timeout=10.0)
             elapsed_ms = (time.monotonic() - start_req_time) * 1000
 
             self.connection_stats["total_sent"] += 1
@@ -1385,12 +1511,7 @@ class TelemetryBridge:
                             self._debug_log_throttled("✅ Data Cloud telemetry sent successfully")
                     except Exception as e:
                         logging.error(f"❌ Failed to send telemetry to Data Cloud: {e}")
-
-                # Reset aggregation ONLY after successful send of a completed lap payload
-                if self.lap_just_completed:
-                     logging.info(f"Resetting aggregation data for new lap ({self.current_lap_num}).")
-                     self._reset_lap_aggregates()
-                     self.lap_just_completed = False # Reset flag after processing
+                return True
 
             else:
                 # Log failure details
@@ -1427,6 +1548,7 @@ class TelemetryBridge:
              logging.exception(f"💥 Unexpected error during send [{elapsed_ms:.0f}ms]")
              self.connection_stats["total_failed"] += 1
              self.send_retries += 1
+        return False
 
 
     def _update_send_interval(self):
@@ -1555,7 +1677,7 @@ class TelemetryBridge:
         current_time = time.time()
         
         # Only log if enough time has passed or if this is a critical message
-        if (current_time - self._last_debug_log) >= LOG_THROTTLE_INTERVAL:
+        if (current_time - self._last_debug_log) >= LOG_THROTTLE_INTERVAL_S:
             logging.debug(f"[Throttled Logs] {message}")
             self._last_debug_log = current_time
             self._log_counter = 0
@@ -1581,6 +1703,7 @@ class TelemetryBridge:
         """Starts the UDP listener and main processing loop."""
         try:
             self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            set_udp_recv_buffer(self.sock)
             self.sock.bind((self.udp_ip, self.udp_port))
             self.sock.settimeout(SOCKET_TIMEOUT_S)
             logging.info(f"✅ Socket bound successfully to {self.udp_ip}:{self.udp_port}")
@@ -1599,7 +1722,8 @@ class TelemetryBridge:
             try:
                 # 1. Receive Data
                 try:
-                    received_data, addr = self.sock.recvfrom(PACKET_BUFFER_SIZE)
+                    received_size, addr = self.sock.recvfrom_into(self._recv_buf, PACKET_BUFFER_SIZE)
+                    received_data = self._recv_view[:received_size]
                     if self.packets_received == 0:
                         logging.info(f"✅ CONNECTED! Receiving F1 telemetry data from {addr}")
                     self.packets_received += 1
@@ -1615,6 +1739,12 @@ class TelemetryBridge:
                     time.sleep(1) # Wait a bit before retrying
                     continue # Skip rest of the loop iteration
 
+                # Drop packets we never use (motion, participants, ...) before paying for the header parse.
+                # Only for supported formats: anything else falls through to the format warning below
+                if (received_data and PacketHeader.peek_packet_id(received_data) in IGNORED_PACKET_IDS
+                        and PacketHeader.peek_packet_format(received_data) in self._packet_dispatch):
+                    received_data = None
+
                 # 2. Process Data (if received in this iteration)
                 if received_data:
                     header = PacketHeader.from_bytes(received_data)
@@ -1625,7 +1755,8 @@ class TelemetryBridge:
                         continue
 
                     # Check format (supports both F1 24 and F1 25) - CRITICAL CHECK
-                    if header.m_packetFormat not in [2024, 2025]:
+                    dispatch = self._packet_dispatch.get(header.m_packetFormat)
+                    if dispatch is None:
                          # Log only periodically or if it changes, to avoid spam if receiving old format
                          if self.packets_received % 100 == 1: # Log first time and then every 100 packets
                               logging.warning(f"Ignoring packet with format {header.m_packetFormat} (Expected 2024 or 2025). Ensure game telemetry is set to F1 2024 or F1 2025 format.")
@@ -1641,86 +1772,36 @@ class TelemetryBridge:
                     if 0 <= self.player_car_index < self.NUM_CARS: # Check index validity
                         # Store the latest header for frame ID
                         self.latest_header = header
+                        # A view past the header - the parsers read in place, so the
+                        # datagram body is never copied
                         packet_data = received_data[PacketHeader.SIZE:]
-                        packet_processed = False # Flag to check if any handler processed it
+                        packet_id = header.m_packetId
 
                         # --- Dispatch to Packet Handlers ---
-                        if header.m_packetId == PACKET_ID_LAP_DATA:
-                            # <<< ADDED DEBUGGING AROUND HERE >>>
-                            logging.debug(f"Processing LAP_DATA packet (ID {header.m_packetId})")
-                            logging.debug(f"Header Details: Format={header.m_packetFormat}, GameYear={header.m_gameYear}, PacketVer={header.m_packetVersion}, SessionTime={header.m_sessionTime:.3f}")
-                            logging.debug(f"Size of packet_data payload for LapData: {len(packet_data)} bytes")
-                            # <<< END DEBUGGING >>>
-                            packet = PacketLapData.from_bytes(header, packet_data);
+                        entry = dispatch.get(packet_id)
+                        if entry is not None:
+                            parser, handler = entry
+                            # Only format the record when --debug is on; %-args defer the rest to the handler
+                            if self.debug_mode and packet_id == PACKET_ID_LAP_DATA:
+                                logging.debug("LAP_DATA packet: Format=%d, GameYear=%d, PacketVer=%d, SessionTime=%.3f, Payload=%d bytes",
+                                              header.m_packetFormat, header.m_gameYear, header.m_packetVersion,
+                                              header.m_sessionTime, len(packet_data))
+                            packet = parser(header, packet_data)
                             if packet:
-                                self._handle_lap_data(packet)
-                                packet_processed = True
+                                handler(packet)
+                                self._state_changed = True
                             else:
-                                logging.warning(f"Failed to parse PacketLapData (Header: {header})")
+                                logging.warning(f"Failed to parse {parser.__self__.__name__} (Header: {header})")
 
-                        elif header.m_packetId == PACKET_ID_CAR_TELEMETRY:
-                            packet = PacketCarTelemetry.from_bytes(header, packet_data);
-                            if packet:
-                                self._handle_telemetry(packet)
-                                packet_processed = True
-                            else:
-                                logging.warning(f"Failed to parse PacketCarTelemetry (Header: {header})")
+                        elif packet_id == PACKET_ID_EVENT:
+                            self._handle_event(header, packet_data) # Event handler doesn't return parsed packet
+                            self._state_changed = True
 
-                        elif header.m_packetId == PACKET_ID_CAR_STATUS:
-                            packet = PacketCarStatus.from_bytes(header, packet_data);
-                            if packet:
-                                self._handle_car_status(packet)
-                                packet_processed = True
-                            else:
-                                logging.warning(f"Failed to parse PacketCarStatus (Header: {header})")
-
-                        elif header.m_packetId == PACKET_ID_CAR_DAMAGE:
-                             packet = PacketCarDamage.from_bytes(header, packet_data) # Parse damage
-                             if packet:
-                                 self._handle_damage(packet)
-                                 packet_processed = True # Handle damage
-                             else:
-                                logging.warning(f"Failed to parse PacketCarDamage (Header: {header})")
-
-                        elif header.m_packetId == PACKET_ID_EVENT:
-                            self._handle_event(header, packet_data)
-                            packet_processed = True # Event handler doesn't return parsed packet
-
-                        elif header.m_packetId == PACKET_ID_SESSION:
-                            packet = PacketSessionData.from_bytes(header, packet_data)
-                            if packet:
-                                self._handle_session(packet)
-                                packet_processed = True
-                            else:
-                                logging.warning(f"Failed to parse PacketSessionData (Header: {header})")
-
-                        elif header.m_packetId == PACKET_ID_LAP_POSITIONS:
-                            # New in F1 25 - lap positions history
-                            if header.m_packetFormat == 2025:
-                                packet = PacketLapPositions.from_bytes(header, packet_data)
-                                if packet:
-                                    self._handle_lap_positions(packet)
-                                    packet_processed = True
-                                else:
-                                    logging.warning(f"Failed to parse PacketLapPositions (Header: {header})")
-                            else:
-                                # Ignore for F1 24
-                                packet_processed = True
-
-                        # --- End Packet Handlers ---
-
-                        # Log if a packet ID was received but not handled by any 'if/elif' block above
-                        # Filter out common noisy packets if they are not needed
-                        ignored_packet_ids = {
-                            PACKET_ID_MOTION, PACKET_ID_PARTICIPANTS,
-                            PACKET_ID_CAR_SETUPS, PACKET_ID_FINAL_CLASSIFICATION, PACKET_ID_LOBBY_INFO,
-                            PACKET_ID_SESSION_HISTORY, PACKET_ID_TYRE_SETS, PACKET_ID_MOTION_EX,
-                            PACKET_ID_TIME_TRIAL
-                        }
-                        if not packet_processed and header.m_packetId not in ignored_packet_ids:
+                        # Log packet IDs nothing handles, filtering out the common noisy ones we don't need
+                        elif packet_id not in IGNORED_PACKET_IDS:
                               # Log less frequently to avoid spam
                               if self.packets_received % 50 == 1:
-                                   logging.debug(f"Received unhandled packet ID: {header.m_packetId} (Header: {header})")
+                                   logging.debug(f"Received unhandled packet ID: {packet_id} (Header: {header})")
                     elif self.player_car_index == 255:
                         # Spectator mode, maybe log less frequently
                         if self.packets_received % 200 == 1:
@@ -1735,11 +1816,21 @@ class TelemetryBridge:
 
                 # 3. Send Periodically - Optimized for local operation
                 now = time.time()
-                if now - self.last_send_time >= self.current_send_interval:
+                since_last_send = now - self.last_send_time
+                if since_last_send >= self.current_send_interval and (self._state_changed or since_last_send >= IDLE_SEND_INTERVAL_S):
                     # Skip send_interval adjustment for local operation to maximize throughput
-                    # Always send a payload, even if no data is available yet
-                    # This keeps the dashboard alive and responsive
-                    self.executor.submit(self._send_payload, self.latest_header)
+                    # Payloads go out as fast as new packets are handled; when nothing new has
+                    # arrived (game paused, no data yet) a heartbeat keeps the dashboard alive
+                    self._state_changed = False
+                    if PERFORMANCE_MODE:
+                        # Building the payload is cheap and reads the handlers' state, so it happens
+                        # here on the receive thread; only the POST goes to the sender thread
+                        try:
+                            self._send_payload(self.latest_header)
+                        except Exception as e:
+                            logging.error(f"Failed to prepare payload: {e}")
+                    else:
+                        self.executor.submit(self._send_payload, self.latest_header)
                     self.last_send_time = now # Update last send time *after* submitting
 
                 # 4. Periodic Status Update (optimized interval)
@@ -1769,6 +1860,13 @@ class TelemetryBridge:
                 self.sock = None
             except Exception as e:
                 logging.error(f"Error closing socket: {e}")
+        if PERFORMANCE_MODE and self._sender_thread is not None:
+            logging.info("Stopping HTTP sender (sending queued payloads)...")
+            with self._send_ready:
+                self._sender_running = False
+                self._send_ready.notify()
+            self._sender_thread.join(timeout=SENDER_SHUTDOWN_TIMEOUT_S)
+            self._sender_thread = None
         if self.executor:
             try:
                 logging.info("Shutting down thread pool executor (waiting for tasks)...")
@@ -1778,6 +1876,7 @@ class TelemetryBridge:
                 self.executor = None
             except Exception as e:
                 logging.error(f"Error shutting down executor: {e}")
+        self.http_session.close()
         logging.info(f"✅ {APP_NAME} shutdown complete.")
 
 
@@ -1827,7 +1926,8 @@ if __name__ == "__main__":
         exit_code = 1
     finally:
         # Ensure shutdown is called even if run() exits unexpectedly or KeyboardInterrupt occurs
-        if bridge and bridge.executor is not None: # Check if bridge and executor exist
+        # shutdown() is idempotent, so this is a no-op when run() already cleaned up
+        if bridge is not None:
              logging.info("Ensuring final shutdown in finally block...")
              bridge.shutdown()
     sys.exit(exit_code)
\ No newline at end of file
@@ -13,12 +13,17 @@ from receiver import (
     PacketHeader, PacketLapData, PacketCarTelemetry,
     PacketCarStatus, PacketCarDamage, PacketSessionData,
     PACKET_ID_MOTION, PACKET_ID_SESSION, PACKET_ID_LAP_DATA,
-    PACKET_ID_CAR_TELEMETRY, PACKET_ID_CAR_STATUS, PACKET_ID_CAR_DAMAGE
+    PACKET_ID_CAR_TELEMETRY, PACKET_ID_CAR_STATUS, PACKET_ID_CAR_DAMAGE,
+    set_udp_recv_buffer
 )
 
 logger = logging.getLogger(__name__)
 
 # Simple motion data parsing for world positions
+MOTION_DATA_SIZE = 60
+# worldPositionX, (skip worldPositionY), worldPositionZ - only X/Z feed the track map
+MOTION_POSITION_XZ = struct.Struct('<f4xf')
+
 def parse_motion_packet(payload: bytes, player_index: int):
     """
     Parse motion packet to extract world position for player
@@ -28,11 +33,11 @@ def parse_motion_packet(payload: bytes, player_index: int):
     - worldPositionZ (float, 4 bytes)
     - ...more fields we don't need...
     """
-    MOTION_DATA_SIZE = 60
     offset = player_index * MOTION_DATA_SIZE
 
-    if offset + 12 <= len(payload):
-        world_x, world_y, world_z = struct.unpack('<fff', payload[offset:offset+12])
+    if offset + MOTION_POSITION_XZ.size <= len(payload):
+        # unpack_from reads in place - no slice copy of the 1.3KB payload per frame
+        world_x, world_z = MOTION_POSITION_XZ.unpack_from(payload, offset)
         return {'worldPositionX': world_x, 'worldPositionZ': world_z}
     return None
 
@@ -105,6 +110,16 @@ class F1TelemetryReceiverMulti:
         self.override_player_index = None  # If set, use this instead of header
         self.player_index_locked = False  # Once we find the right index, lock it
 
+        # Packet ID -> handler; packets not listed here are dropped after the header
+        self._packet_handlers: Dict[int, Callable[[PacketHeader, bytes], None]] = {
+            PACKET_ID_MOTION: self._handle_motion,
+            PACKET_ID_LAP_DATA: self._handle_lap_data,
+            PACKET_ID_CAR_TELEMETRY: self._handle_car_telemetry,
+            PACKET_ID_CAR_STATUS: self._handle_car_status,
+            PACKET_ID_CAR_DAMAGE: self._handle_car_damage,
+            PACKET_ID_SESSION: self._handle_session,
+        }
+
         logger.info(f"Initialized receiver for {rig_id} (driver: {driver_name}, port: {port})")
 
     def run(self):
@@ -115,15 +130,21 @@ class F1TelemetryReceiverMulti:
             # Create UDP socket
             self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
             self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            set_udp_recv_buffer(self.socket)
             self.socket.bind(('0.0.0.0', self.port))
             self.socket.settimeout(1.0)  # 1 second timeout for clean shutdown
 
             self.running = True
             logger.info(f"[{self.rig_id}] ✓ Listening on 0.0.0.0:{self.port}")
 
+            # Datagrams are received into one reused buffer; handlers copy out what they keep
+            recv_buf = bytearray(2048)
+            recv_view = memoryview(recv_buf)
+
             while self.running:
                 try:
-                    data, addr = self.socket.recvfrom(2048)
+                    size, addr = self.socket.recvfrom_into(recv_buf)
+                    data = recv_view[:size]
 
                     # Log first packet received to confirm UDP is working
                     if self.packet_count == 0:
@@ -154,36 +175,29 @@ class F1TelemetryReceiverMulti:
         if len(data) < PacketHeader.SIZE:
             return
 
+        self.packet_count += 1
+        self.last_packet_time = time.time()
+
+        # Route to appropriate handler - peek the ID so unused packets skip the header parse
+        packet_id = PacketHeader.peek_packet_id(data)
+        handler = self._packet_handlers.get(packet_id)
+        if handler is None:
+            return
+
         # Parse packet header
         header = PacketHeader.from_bytes(data)
         if not header:
             return
 
-        self.packet_count += 1
-        self.last_packet_time = time.time()
-        self.latest_header = header
-
         # Log packet format once per session for debugging
-        if self.packet_count == 1:
+        if self.latest_header is None:
             logger.info(f"[{self.rig_id}] Game telemetry format: {header.m_packetFormat} (Year: {header.m_gameYear})")
+        self.latest_header = header
 
-        # Route to appropriate handler
-        packet_id = header.m_packetId
-        payload = data[PacketHeader.SIZE:]
+        payload = memoryview(data)[PacketHeader.SIZE:]  # Parsers read in place; no copy of the body
 
         try:
-            if packet_id == PACKET_ID_MOTION:
-                self._handle_motion(header, payload)
-            elif packet_id == PACKET_ID_LAP_DATA:
-                self._handle_lap_data(header, payload)
-            elif packet_id == PACKET_ID_CAR_TELEMETRY:
-                self._handle_car_telemetry(header, payload)
-            elif packet_id == PACKET_ID_CAR_STATUS:
-                self._handle_car_status(header, payload)
-            elif packet_id == PACKET_ID_CAR_DAMAGE:
-                self._handle_car_damage(header, payload)
-            elif packet_id == PACKET_ID_SESSION:
-                self._handle_session(header, payload)
+            handler(header, payload)
         except Exception as e:
             logger.debug(f"[{self.rig_id}] Error processing packet {packet_id}: {e}")
 
@@ -90,8 +90,16 @@ class TrackMap {
         // Segments for rendering marshal zones
         this.segments = [];
 
+        // Debounce resize: dragging a window edge fires a storm of events and
+        // each resize() recomputes scaling and redraws the whole track
+        this.resizeTimer = null;
+        this.resizeDebounceMs = 50;
+
         this.resize();
-        window.addEventListener('resize', () => this.resize());
+        window.addEventListener('resize', () => {
+            clearTimeout(this.resizeTimer);
+            this.resizeTimer = setTimeout(() => this.resize(), this.resizeDebounceMs);
+        });
     }
 
     resize() {
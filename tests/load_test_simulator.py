@@ -4,14 +4,20 @@ F1 Dashboard Load Testing Simulator
 Simulates high-frequency F1 telemetry data to test dashboard performance under load
 """
 
+import ctypes
+import ctypes.util
 import socket
 import struct
 import time
 import threading
 import argparse
+import collections
 import logging
+import os
+import queue
 import random
 import sys
+from errno import EAGAIN, ECONNREFUSED, EWOULDBLOCK
 from typing import List, Dict, Any
 from dataclasses import dataclass
 
@@ -20,6 +26,59 @@ PACKET_FORMAT = 2024
 GAME_YEAR = 24
 PACKET_VERSION = 1
 
+# Wire formats (must match the receiver's decoders in src/receiver.py)
+HEADER_FORMAT = "<HBBBBBQfIIBB"
+HEADER_PACKET_ID_OFFSET = 6                             # m_packetId
+HEADER_TIMING_OFFSET = 15                               # m_sessionTime, m_frameIdentifier, m_overallFrameIdentifier
+HEADER_TIMING_FORMAT = "<fII"
+LAP_DATA_CAR_FORMAT = "IIHBHBHBHBfffBBBBBBBBBBBBBBBHHBfB"  # 33 fields, 57 bytes
+LAP_DATA_TRAILER_FORMAT = "BB"                          # timeTrialPBCarIdx, timeTrialRivalCarIdx
+TELEMETRY_CAR_FORMAT = "HfffBbHBBH4H4B4BH4f4B"           # 31 fields, 60 bytes
+TELEMETRY_TRAILER_FORMAT = "BBb"                        # mfdPanelIndex, mfdPanelIndexSecondaryPlayer, suggestedGear
+LAP_DATA_FIELDS_PER_CAR = 33
+TELEMETRY_FIELDS_PER_CAR = 31
+
+# Length of each pre-generated cyclic pool of random field values
+RANDOM_POOL_SIZE = 4096
+
+# Upper bound on packets produced in one simulation tick (lap + telemetry + 3 stress)
+MAX_PACKETS_PER_TICK = 8
+
+# Outgoing packet buffers kept in the pool (comfortably more than one tick needs)
+PACKET_POOL_SIZE = 16
+
+# Requested UDP send buffer; Linux caps this at net.core.wmem_max, so raise that
+# sysctl (e.g. sysctl -w net.core.wmem_max=4194304) to get the full size
+SEND_BUFFER_BYTES = 4 * 1024 * 1024
+
+
+# --- sendmmsg(2) batching (Linux only, falls back to sendto elsewhere) ---
+
+class _IOVec(ctypes.Structure):
+    _fields_ = [("iov_base", ctypes.c_void_p), ("iov_len", ctypes.c_size_t)]
+
+class _MsgHdr(ctypes.Structure):
+    _fields_ = [("msg_name", ctypes.c_void_p), ("msg_namelen", ctypes.c_uint32),
+                ("msg_iov", ctypes.POINTER(_IOVec)), ("msg_iovlen", ctypes.c_size_t),
+                ("msg_control", ctypes.c_void_p), ("msg_controllen", ctypes.c_size_t),
+                ("msg_flags", ctypes.c_int)]
+
+class _MMsgHdr(ctypes.Structure):
+    _fields_ = [("msg_hdr", _MsgHdr), ("msg_len", ctypes.c_uint)]
+
+def _load_sendmmsg():
+    """Return libc's sendmmsg, or None where it is unavailable"""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        sendmmsg = libc.sendmmsg
+    except (OSError, AttributeError):
+        return None
+    sendmmsg.argtypes = [ctypes.c_int, ctypes.POINTER(_MMsgHdr), ctypes.c_uint, ctypes.c_int]
+    sendmmsg.restype = ctypes.c_int
+    return sendmmsg
+
 @dataclass
 class TestConfig:
     packets_per_second: float = 60.0  # Normal F1 game frequency
@@ -33,11 +92,45 @@ class TestConfig:
 class F1PacketSimulator:
     """Simulates F1 24 UDP telemetry packets for load testing"""
     
+    # Fixed attribute layout: no per-instance __dict__ on the hot-path object
+    __slots__ = (
+        # Run configuration (copied from TestConfig for single-hop access)
+        'config', 'target_host', 'target_port', 'packets_per_second',
+        'duration_seconds', 'num_cars', 'stress_test',
+        # Run state and statistics
+        'socket', 'running', 'logger', 'packets_sent', 'packets_dropped',
+        'send_errors', 'last_send_error', 'start_time',
+        # Simulation and car state
+        'session_time', 'frame_id', 'lap_number', 'lap_time_ms', 'sector', 'position',
+        'speed', 'rpm', 'gear', 'throttle', 'brake', 'steering', 'lap_distance',
+        # Packet building
+        '_header_struct', '_header_timing', '_header_template', '_lap_struct', '_tele_struct',
+        '_lap_packet_size', '_tele_packet_size', '_packet_buffer_size', '_buffer_pool',
+        '_buffer_addrs', '_lap_scratch', '_tele_scratch', '_pool_cursor', '_lap_columns',
+        '_lap_time_offsets', '_lap_distance_offsets', '_tele_columns', '_speed_offsets',
+        '_rpm_offsets', '_gear_offsets', '_fill_lap_values', '_fill_tele_values',
+        # Sending
+        '_sendmmsg', '_socket_fd', '_mmsg_iovs', '_mmsg_hdrs', '_tx_queue', '_sender_thread',
+    )
+    
     def __init__(self, config: TestConfig):
         self.config = config
+        self.target_host = config.target_host
+        self.target_port = config.target_port
+        self.packets_per_second = config.packets_per_second
+        self.duration_seconds = config.duration_seconds
+        self.num_cars = config.num_cars
+        self.stress_test = config.stress_test
         self.socket = None
+        self._sendmmsg = None
+        # Ticks handed from the simulation loop to the sender thread (None stops it)
+        self._tx_queue = queue.SimpleQueue()
+        self._sender_thread = None
         self.running = False
         self.packets_sent = 0
+        self.packets_dropped = 0  # Sends refused because the socket buffer was full
+        self.send_errors = 0      # Other send failures, reported once at shutdown
+        self.last_send_error = None
         self.start_time = 0
         
         # Simulation state
@@ -57,6 +150,119 @@ class F1PacketSimulator:
         self.steering = 0.0
         self.lap_distance = 0.0
         
+        # Packet layouts only depend on num_cars, so compile them once and
+        # pack into reusable buffers instead of rebuilding format strings per packet
+        num_cars = config.num_cars
+        self._header_struct = struct.Struct(HEADER_FORMAT)
+        self._header_timing = struct.Struct(HEADER_TIMING_FORMAT)
+        # Constant header fields are stamped into every pool buffer once; only
+        # the packet id and timing fields are rewritten per packet
+        self._header_template = self._header_struct.pack(
+            PACKET_FORMAT,      # m_packetFormat
+            GAME_YEAR,          # m_gameYear
+            1,                  # m_gameMajorVersion
+            0,                  # m_gameMinorVersion
+            PACKET_VERSION,     # m_packetVersion
+            0,                  # m_packetId (patched per packet)
+            12345678,           # m_sessionUID
+            0.0,                # m_sessionTime (patched per packet)
+            0,                  # m_frameIdentifier (patched per packet)
+            0,                  # m_overallFrameIdentifier (patched per packet)
+            0,                  # m_playerCarIndex
+            255                 # m_secondaryPlayerCarIndex
+        )
+        self._lap_struct = struct.Struct(
+            "<" + LAP_DATA_CAR_FORMAT * num_cars + LAP_DATA_TRAILER_FORMAT)
+        self._tele_struct = struct.Struct(
+            "<" + TELEMETRY_CAR_FORMAT * num_cars + TELEMETRY_TRAILER_FORMAT)
+        self._lap_packet_size = self._header_struct.size + self._lap_struct.size
+        self._tele_packet_size = self._header_struct.size + self._tele_struct.size
+        
+        # Pool of reusable outgoing buffers; builders fill one, the sender returns it
+        self._packet_buffer_size = max(self._lap_packet_size, self._tele_packet_size)
+        self._buffer_pool = collections.deque()
+        self._buffer_addrs: Dict[int, int] = {}
+        for _ in range(PACKET_POOL_SIZE):
+            self._buffer_pool.append(self._new_buffer())
+        # Pre-sized value lists handed to pack_into; fields that never change are
+        # filled here once and the builders only overwrite the varying columns
+        self._lap_scratch = [0] * (LAP_DATA_FIELDS_PER_CAR * num_cars) + [255, 255]  # No time trial PB/rival car
+        self._lap_scratch[13:LAP_DATA_FIELDS_PER_CAR * num_cars:LAP_DATA_FIELDS_PER_CAR] = [
+            min(car_idx + 1, 22) for car_idx in range(num_cars)]  # m_carPosition
+        self._lap_scratch[32:LAP_DATA_FIELDS_PER_CAR * num_cars:LAP_DATA_FIELDS_PER_CAR] = [
+            255] * num_cars  # m_speedTrapFastestLap (not set)
+        self._tele_scratch = [0] * (TELEMETRY_FIELDS_PER_CAR * num_cars) + [0, 255, 0]  # mfdPanelIndex, secondary, suggestedGear
+        
+        # Random per-car values come from cyclic pools generated once here; a packet
+        # takes a num_cars slice of each pool at a shared cursor. Fields with fixed
+        # bounds are pooled as-is (slot in the scratch list, pool); fields that
+        # depend on the simulation state pool only the per-car offset
+        self._pool_cursor = 0
+        self._lap_columns = [
+            (2, self._int_pool(20000, 30000)),     # m_sector1TimeMSPart
+            (4, self._int_pool(25000, 35000)),     # m_sector2TimeMSPart
+            (6, self._int_pool(0, 1000)),          # m_deltaToCarInFrontMSPart
+            (8, self._int_pool(0, 5000)),          # m_deltaToRaceLeaderMSPart
+            (12, self._float_pool(-2.0, 2.0)),     # m_safetyCarDelta
+            (16, self._int_pool(0, 3)),            # m_numPitStops
+            (22, self._int_pool(1, 20)),           # m_numUnservedDriveThroughPens
+            (23, self._int_pool(1, 20)),           # m_numUnservedStopGoPens
+            (24, self._int_pool(0, 3)),            # m_gridPosition
+            (28, self._int_pool(15000, 20000)),    # m_pitLaneTimeInLaneInMS
+            (29, self._int_pool(2000, 4000)),      # m_pitStopTimerInMS
+            (31, self._float_pool(280.0, 340.0)),  # m_speedTrapFastestSpeed
+        ]
+        self._lap_time_offsets = self._int_pool(-1000, 1000)
+        self._lap_distance_offsets = self._float_pool(-100.0, 100.0)
+        self._tele_columns = [
+            (4, self._int_pool(0, 100)),           # m_clutch
+            (7, self._int_pool(0, 1)),             # m_drs
+            (8, self._int_pool(0, 100)),           # m_revLightsPercent
+            (9, self._int_pool(0, 32767)),         # m_revLightsBitValue
+            (22, self._int_pool(80, 110)),         # m_engineTemperature
+        ]
+        for wheel in range(4):
+            self._tele_columns += [
+                (10 + wheel, self._int_pool(200, 800)),      # m_brakesTemperature
+                (14 + wheel, self._int_pool(80, 120)),       # m_tyresSurfaceTemperature
+                (18 + wheel, self._int_pool(85, 125)),       # m_tyresInnerTemperature
+                (23 + wheel, self._float_pool(18.0, 25.0)),  # m_tyresPressure
+                (27 + wheel, self._int_pool(0, 16)),         # m_surfaceType
+            ]
+        self._speed_offsets = self._float_pool(-20.0, 20.0)
+        self._rpm_offsets = self._int_pool(-500, 500)
+        self._gear_offsets = self._int_pool(-1, 1)
+        
+        # num_cars is fixed for the run, so generate straight-line fill functions
+        # for the varying columns (min/max clamps become conditional expressions)
+        self._fill_lap_values = self._compile_fill(
+            "fill_lap_values", LAP_DATA_FIELDS_PER_CAR, self._lap_columns,
+            params=("last_lap_time_ms", "lap_time_ms", "lap_distance", "total_distance_offset", "sector"),
+            offsets={"lap_time_offsets": self._lap_time_offsets,
+                     "lap_distance_offsets": self._lap_distance_offsets},
+            prelude=("d{i} = lap_distance + lap_distance_offsets[c + {i}]",),  # Vary data slightly for each car
+            computed=(
+                (0, "last_lap_time_ms"),                                                    # m_lastLapTimeInMS
+                (1, "v if (v := lap_time_ms + lap_time_offsets[c + {i}]) > 0 else 0"),     # m_currentLapTimeInMS
+                (10, "d{i} if d{i} > 0 else 0"),                                            # m_lapDistance
+                (11, "d{i} + total_distance_offset"),                                       # m_totalDistance
+                (17, "sector"),                                                             # m_sector
+            ))
+        self._fill_tele_values = self._compile_fill(
+            "fill_tele_values", TELEMETRY_FIELDS_PER_CAR, self._tele_columns,
+            params=("speed", "throttle", "steering", "brake", "gear", "rpm"),
+            offsets={"speed_offsets": self._speed_offsets,
+                     "gear_offsets": self._gear_offsets,
+                     "rpm_offsets": self._rpm_offsets},
+            computed=(
+                (0, "int(v) if (v := speed + speed_offsets[c + {i}]) > 0 else 0"),        # m_speed
+                (1, "throttle"),                                                            # m_throttle
+                (2, "steering"),                                                            # m_steer
+                (3, "brake"),                                                               # m_brake
+                (5, "-1 if (v := gear + gear_offsets[c + {i}]) < -1 else 8 if v > 8 else v"),  # m_gear
+                (6, "v if (v := rpm + rpm_offsets[c + {i}]) > 1000 else 1000"),            # m_engineRPM
+            ))
+        
         self.setup_logging()
     
     def setup_logging(self):
@@ -67,262 +273,357 @@ class F1PacketSimulator:
         )
         self.logger = logging.getLogger(__name__)
     
-    def create_packet_header(self, packet_id: int) -> bytes:
-        """Create F1 24 packet header"""
-        header_format = "<HBBBBBQfIIBB"
-        
-        header_data = (
-            PACKET_FORMAT,      # m_packetFormat
-            GAME_YEAR,          # m_gameYear
-            1,                  # m_gameMajorVersion
-            0,                  # m_gameMinorVersion
-            PACKET_VERSION,     # m_packetVersion
-            packet_id,          # m_packetId
-            12345678,           # m_sessionUID
-            self.session_time,  # m_sessionTime
-            self.frame_id,      # m_frameIdentifier
-            self.frame_id + 100000,  # m_overallFrameIdentifier
-            0,                  # m_playerCarIndex
-            255                 # m_secondaryPlayerCarIndex
+    def _new_buffer(self) -> bytearray:
+        """Allocate a pool buffer and remember its address for sendmmsg"""
+        buf = bytearray(self._packet_buffer_size)
+        buf[:len(self._header_template)] = self._header_template
+        # Pool buffers are never resized, so the address stays valid for the run
+        self._buffer_addrs[id(buf)] = ctypes.addressof(ctypes.c_char.from_buffer(buf))
+        return buf
+    
+    def _acquire_buffer(self) -> bytearray:
+        """Take a buffer from the pool (grows the pool if it is ever exhausted)"""
+        try:
+            return self._buffer_pool.pop()
+        except IndexError:
+            return self._new_buffer()
+    
+    def _release_buffer(self, packet: memoryview):
+        """Return the buffer behind a sent packet to the pool"""
+        self._buffer_pool.append(packet.obj)
+    
+    def create_packet_header(self, packet_id: int, buffer: bytearray):
+        """Patch the per-packet F1 24 header fields into a pool buffer's header template"""
+        buffer[HEADER_PACKET_ID_OFFSET] = packet_id
+        self._header_timing.pack_into(
+            buffer, HEADER_TIMING_OFFSET,
+            self.session_time, self.frame_id, self.frame_id + 100000
         )
-        
-        return struct.pack(header_format, *header_data)
     
-    def create_lap_data_packet(self) -> bytes:
-        """Create a lap data packet"""
-        header = self.create_packet_header(2)  # PACKET_ID_LAP_DATA = 2
-        
-        # Lap data format for one car (simplified)
-        lap_data_format = "<" + "II HBHB HBHB fff BBBB BBB Bf BBB" * self.config.num_cars
+    def _int_pool(self, low: int, high: int) -> List[int]:
+        """Cyclic pool of random ints in [low, high], long enough for any cursor slice"""
+        randint = random.randint
+        return [randint(low, high) for _ in range(RANDOM_POOL_SIZE + self.num_cars)]
+    
+    def _float_pool(self, low: float, high: float) -> List[float]:
+        """Cyclic pool of random floats in [low, high], long enough for any cursor slice"""
+        uniform = random.uniform
+        return [uniform(low, high) for _ in range(RANDOM_POOL_SIZE + self.num_cars)]
+    
+    def _next_pool_cursor(self) -> int:
+        """Advance the pool cursor by one packet's worth of cars"""
+        i = self._pool_cursor
+        self._pool_cursor = (i + self.num_cars) % RANDOM_POOL_SIZE
+        return i
+    
+    def _compile_fill(self, name: str, fields_per_car: int, pooled: List[tuple], params: tuple,
+                      offsets: Dict[str, List], computed: tuple, prelude: tuple = ()):
+        """Generate a fill function for one packet type, unrolled for num_cars
         
-        lap_data_values = []
-        for car_idx in range(self.config.num_cars):
-            # Vary data slightly for each car
-            car_lap_time = self.lap_time_ms + random.randint(-1000, 1000)
-            car_position = min(car_idx + 1, 22)
-            car_lap_distance = self.lap_distance + random.uniform(-100, 100)
-            
-            lap_data_values.extend([
-                max(0, self.lap_time_ms - 90000),  # m_lastLapTimeInMS
-                car_lap_time,                      # m_currentLapTimeInMS
-                random.randint(20000, 30000),      # m_sector1TimeMSPart
-                0,                                 # m_sector1TimeMinutesPart
-                random.randint(25000, 35000),      # m_sector2TimeMSPart
-                0,                                 # m_sector2TimeMinutesPart
-                random.randint(-1000, 1000),       # m_deltaToCarInFrontMSPart
-                0,                                 # m_deltaToCarInFrontMinutesPart
-                random.randint(-5000, 5000),       # m_deltaToRaceLeaderMSPart
-                0,                                 # m_deltaToRaceLeaderMinutesPart
-                max(0, car_lap_distance),          # m_lapDistance
-                car_lap_distance + (self.lap_number - 1) * 5000,  # m_totalDistance
-                random.uniform(-2.0, 2.0),         # m_safetyCarDelta
-                car_position,                      # m_carPosition
-                0,                                 # m_currentLapNum (will be set correctly)
-                0,                                 # m_pitStatus
-                random.randint(0, 3),              # m_numPitStops
-                self.sector,                       # m_sector
-                0,                                 # m_currentLapInvalid
-                0,                                 # m_penalties
-                0,                                 # m_totalWarnings
-                0,                                 # m_cornerCuttingWarnings
-                random.randint(1, 20),             # m_numUnservedDriveThroughPens
-                random.randint(1, 20),             # m_numUnservedStopGoPens
-                random.randint(0, 3),              # m_gridPosition
-                0,                                 # m_driverStatus
-                0,                                 # m_resultStatus
-                0,                                 # m_pitLaneTimerActive
-                random.randint(15000, 20000),      # m_pitLaneTimeInLaneInMS
-                random.randint(2000, 4000),        # m_pitStopTimerInMS
-                0                                  # m_pitStopShouldServePen
-            ])
+        The function is called as fill(values, c, *params) with c the pool cursor.
+        Field j of every car is values[j:end:fields_per_car]: pooled columns are
+        copied as pool slices, and each computed column becomes a list display
+        with its per-car template expanded for car i = 0..num_cars-1.
+        """
+        num_cars = self.num_cars
+        end = fields_per_car * num_cars
+        namespace = dict(offsets)
+        lines = [f"def {name}(values, c, {', '.join(params)}):"]
+        for k, (slot, pool) in enumerate(pooled):
+            namespace[f"pool_{k}"] = pool
+            lines.append(f"    values[{slot}:{end}:{fields_per_car}] = pool_{k}[c:c + {num_cars}]")
+        for template in prelude:
+            lines.extend(f"    {template.format(i=i)}" for i in range(num_cars))
+        for slot, template in computed:
+            items = ", ".join(template.format(i=i) for i in range(num_cars))
+            lines.append(f"    values[{slot}:{end}:{fields_per_car}] = [{items}]")
+        exec("\n".join(lines), namespace)
+        return namespace[name]
+    
+    def create_lap_data_packet(self) -> memoryview:
+        """Create a lap data packet in a pool buffer (release it with _release_buffer after sending)"""
+        buf = self._acquire_buffer()
+        self.create_packet_header(2, buf)  # PACKET_ID_LAP_DATA = 2
         
-        # Set correct lap number for player car (car 0)
-        if len(lap_data_values) >= 15:
-            lap_data_values[14] = self.lap_number
+        # Varying per-car fields are written by the generated fill (see __init__)
+        lap_time_ms = self.lap_time_ms
+        lap_data_values = self._lap_scratch
+        self._fill_lap_values(
+            lap_data_values, self._next_pool_cursor(),
+            max(0, lap_time_ms - 90000), lap_time_ms, self.lap_distance,
+            (self.lap_number - 1) * 5000, self.sector)
+        lap_data_values[14] = self.lap_number  # m_currentLapNum, only set for the player car (car 0)
         
+        header_size = self._header_struct.size
         try:
-            data = struct.pack(lap_data_format, *lap_data_values)
-            return header + data
+            self._lap_struct.pack_into(buf, header_size, *lap_data_values)
+            return memoryview(buf)[:self._lap_packet_size]
         except struct.error as e:
             self.logger.error(f"Error packing lap data: {e}")
-            return header  # Return just header if packing fails
+            return memoryview(buf)[:header_size]  # Return just header if packing fails
     
-    def create_telemetry_packet(self) -> bytes:
-        """Create a car telemetry packet"""
-        header = self.create_packet_header(6)  # PACKET_ID_CAR_TELEMETRY = 6
-        
-        # Simplified telemetry data for all cars
-        telemetry_data = []
-        
-        for car_idx in range(self.config.num_cars):
-            # Add some variation between cars
-            car_speed = max(0, self.speed + random.uniform(-20, 20))
-            car_rpm = max(1000, self.rpm + random.randint(-500, 500))
-            car_gear = max(-1, min(8, self.gear + random.randint(-1, 1)))
-            
-            # Brake temperatures (4 values)
-            brake_temps = [random.randint(200, 800) for _ in range(4)]
-            
-            # Tyre surface temperatures (4 values)
-            tyre_surface_temps = [random.randint(80, 120) for _ in range(4)]
-            
-            # Tyre inner temperatures (4 values)
-            tyre_inner_temps = [random.randint(85, 125) for _ in range(4)]
-            
-            # Tyre pressures (4 values)
-            tyre_pressures = [random.uniform(18.0, 25.0) for _ in range(4)]
-            
-            # Surface types (4 values)
-            surface_types = [random.randint(0, 16) for _ in range(4)]
-            
-            telemetry_entry = [
-                int(car_speed),                    # m_speed
-                self.throttle,                     # m_throttle
-                self.steering,                     # m_steer
-                self.brake,                        # m_brake
-                random.uniform(0, 1),              # m_clutch
-                car_gear,                          # m_gear
-                car_rpm,                           # m_engineRPM
-                random.randint(0, 1),              # m_drs
-                random.randint(0, 100),            # m_revLightsPercent
-                random.randint(0, 32767),          # m_revLightsBitValue
-            ]
-            
-            # Add arrays
-            telemetry_entry.extend(brake_temps)
-            telemetry_entry.extend(tyre_surface_temps)
-            telemetry_entry.extend(tyre_inner_temps)
-            telemetry_entry.append(random.randint(80, 110))  # m_engineTemperature
-            telemetry_entry.extend(tyre_pressures)
-            telemetry_entry.extend(surface_types)
-            
-            telemetry_data.extend(telemetry_entry)
+    def create_telemetry_packet(self) -> memoryview:
+        """Create a car telemetry packet in a pool buffer (release it with _release_buffer after sending)"""
+        buf = self._acquire_buffer()
+        self.create_packet_header(6, buf)  # PACKET_ID_CAR_TELEMETRY = 6
         
-        # Add packet-level fields
-        telemetry_data.extend([
-            0,   # m_mfdPanelIndex
-            255, # m_mfdPanelIndexSecondaryPlayer
-            self.gear  # m_suggestedGear
-        ])
+        # Varying per-car fields are written by the generated fill (see __init__)
+        gear = self.gear
+        telemetry_data = self._tele_scratch
+        self._fill_tele_values(
+            telemetry_data, self._next_pool_cursor(),
+            self.speed, self.throttle, self.steering, self.brake, gear, self.rpm)
         
-        # Create format string
-        single_car_format = "<H fff B H BBBB HHHH HHHHf ffff BBBB"
-        telemetry_format = single_car_format[1:] * self.config.num_cars + "BBb"
+        # Packet-level fields (m_mfdPanelIndex / secondary are fixed at 0 / 255)
+        telemetry_data[-1] = gear  # m_suggestedGear
         
+        header_size = self._header_struct.size
         try:
-            data = struct.pack("<" + telemetry_format[1:], *telemetry_data)
-            return header + data
+            self._tele_struct.pack_into(buf, header_size, *telemetry_data)
+            return memoryview(buf)[:self._tele_packet_size]
         except (struct.error, ValueError) as e:
             self.logger.error(f"Error packing telemetry data: {e}")
-            return header
+            return memoryview(buf)[:header_size]
     
     def update_simulation_state(self):
         """Update simulation state for realistic progression"""
+        # State is read into locals once and written back once per tick
+        frame_id = self.frame_id
+        speed = self.speed
+        
         # Simulate car movement and racing
-        if self.frame_id % 20 == 0:  # Update every ~0.33 seconds
+        if frame_id % 20 == 0:  # Update every ~0.33 seconds
+            throttle = self.throttle
+            brake = self.brake
+            rpm = self.rpm
+            gear = self.gear
+            
             # Simulate acceleration/deceleration
-            if random.random() < 0.1:  # 10% chance to change inputs
-                self.throttle = random.uniform(0, 1)
-                self.brake = random.uniform(0, 0.8) if self.throttle < 0.3 else 0
-                self.steering = random.uniform(-0.5, 0.5)
+            # random.uniform(a, b) is a Python wrapper around a + (b - a) * random();
+            # calling random() directly gives the same values for a third of the cost
+            rand = random.random
+            if rand() < 0.1:  # 10% chance to change inputs
+                throttle = rand()
+                brake = 0.8 * rand() if throttle < 0.3 else 0
+                self.steering = -0.5 + rand()
+                self.throttle = throttle
+                self.brake = brake
             
             # Update speed based on inputs
-            if self.throttle > self.brake:
-                self.speed = min(350, self.speed + (self.throttle * 5))
-                self.rpm = min(13000, self.rpm + 100)
+            if throttle > brake:
+                speed = min(350, speed + (throttle * 5))
+                rpm = min(13000, rpm + 100)
             else:
-                self.speed = max(0, self.speed - (self.brake * 10))
-                self.rpm = max(1000, self.rpm - 200)
+                speed = max(0, speed - (brake * 10))
+                rpm = max(1000, rpm - 200)
             
             # Update gear based on RPM
-            if self.rpm > 8000 and self.gear < 8:
-                self.gear += 1
-                self.rpm -= 2000
-            elif self.rpm < 3000 and self.gear > 1:
-                self.gear -= 1
-                self.rpm += 1500
+            if rpm > 8000 and gear < 8:
+                gear += 1
+                rpm -= 2000
+            elif rpm < 3000 and gear > 1:
+                gear -= 1
+                rpm += 1500
+            
+            self.speed = speed
+            self.rpm = rpm
+            self.gear = gear
         
         # Update lap progression
-        distance_increment = max(1, self.speed * 0.016667)  # Approximate distance per frame
-        self.lap_distance += distance_increment
+        lap_distance = self.lap_distance + max(1, speed * 0.016667)  # Approximate distance per frame
+        lap_time_ms = self.lap_time_ms
+        sector = self.sector
         
         # Lap progression (approximate 5km lap)
-        if self.lap_distance > 5000:
+        if lap_distance > 5000:
             self.lap_number += 1
-            self.lap_distance = 0
-            self.lap_time_ms = 0
-            self.sector = 0
-            self.logger.info(f"Simulated lap {self.lap_number - 1} completed")
+            lap_distance = 0
+            lap_time_ms = 0
+            sector = 0
+            self.logger.info("Simulated lap %d completed", self.lap_number - 1)
         
         # Sector progression
-        if self.lap_distance > 1666 and self.sector == 0:
-            self.sector = 1
-        elif self.lap_distance > 3333 and self.sector == 1:
-            self.sector = 2
+        if lap_distance > 1666 and sector == 0:
+            sector = 1
+        elif lap_distance > 3333 and sector == 1:
+            sector = 2
+        
+        self.lap_distance = lap_distance
+        self.sector = sector
         
         # Update lap time
-        self.lap_time_ms += 16  # ~16ms per frame at 60fps
+        self.lap_time_ms = lap_time_ms + 16  # ~16ms per frame at 60fps
         
         # Update session time and frame ID
         self.session_time += 0.016667  # ~60fps
-        self.frame_id += 1
+        self.frame_id = frame_id + 1
     
-    def send_packet(self, packet_data: bytes):
+    def send_packet(self, packet_data):
         """Send a packet via UDP"""
         try:
-            self.socket.sendto(packet_data, (self.config.target_host, self.config.target_port))
+            try:
+                self.socket.send(packet_data)
+            except ConnectionRefusedError:
+                # Pending ICMP error from an earlier send (nothing listening yet);
+                # reporting it clears it, so the retry goes out
+                self.socket.send(packet_data)
             self.packets_sent += 1
+        except BlockingIOError:
+            self.packets_dropped += 1
         except Exception as e:
-            self.logger.error(f"Error sending packet: {e}")
+            self.send_errors += 1
+            self.last_send_error = e
+    
+    def setup_batch_send(self):
+        """Prepare sendmmsg structures so a whole tick goes out in one syscall"""
+        self._socket_fd = self.socket.fileno()
+        self._sendmmsg = _load_sendmmsg()
+        if self._sendmmsg is None:
+            self.logger.debug("sendmmsg unavailable - sending packets individually")
+            return
+        
+        # The socket is connected, so messages carry no destination (msg_name stays NULL)
+        self._mmsg_iovs = (_IOVec * MAX_PACKETS_PER_TICK)()
+        self._mmsg_hdrs = (_MMsgHdr * MAX_PACKETS_PER_TICK)()
+        for i in range(MAX_PACKETS_PER_TICK):
+            hdr = self._mmsg_hdrs[i].msg_hdr
+            hdr.msg_iov = ctypes.pointer(self._mmsg_iovs[i])
+            hdr.msg_iovlen = 1
+        self.logger.debug("Using sendmmsg for batched UDP sends")
+    
+    def send_packets(self, packets: List[memoryview]):
+        """Send all packets built in one tick, with a single sendmmsg call when available"""
+        if self._sendmmsg is None:
+            for packet in packets:
+                self.send_packet(packet)
+            return
+        
+        count = len(packets)
+        iovs = self._mmsg_iovs
+        buffer_addrs = self._buffer_addrs
+        for i, packet in enumerate(packets):
+            iovs[i].iov_base = buffer_addrs[id(packet.obj)]
+            iovs[i].iov_len = len(packet)
+        
+        sent = self._sendmmsg(self._socket_fd, self._mmsg_hdrs, count, 0)
+        if sent < 0 and ctypes.get_errno() == ECONNREFUSED:
+            # Pending ICMP error from an earlier send, retry once as in send_packet
+            sent = self._sendmmsg(self._socket_fd, self._mmsg_hdrs, count, 0)
+        if sent < 0:
+            errno = ctypes.get_errno()
+            if errno in (EAGAIN, EWOULDBLOCK):
+                self.packets_dropped += count
+                return
+            self.send_errors += count
+            self.last_send_error = OSError(errno, os.strerror(errno))
+            return
+        self.packets_sent += sent
+        if sent < count:
+            # Kernel accepted only part of the batch - push the rest individually
+            for packet in packets[sent:]:
+                self.send_packet(packet)
+    
+    def _sender_loop(self):
+        """Drain built ticks onto the socket and return their buffers to the pool"""
+        tx_get = self._tx_queue.get
+        send_packets = self.send_packets
+        release_buffer = self._release_buffer
+        while True:
+            packets = tx_get()
+            if packets is None:
+                break
+            send_packets(packets)
+            for packet in packets:
+                release_buffer(packet)
     
     def run_simulation(self):
         """Run the main simulation loop"""
         self.logger.info(f"Starting F1 load test simulation...")
-        self.logger.info(f"Target: {self.config.target_host}:{self.config.target_port}")
-        self.logger.info(f"Frequency: {self.config.packets_per_second} packets/sec")
-        self.logger.info(f"Duration: {self.config.duration_seconds} seconds")
-        self.logger.info(f"Stress test: {'Yes' if self.config.stress_test else 'No'}")
+        self.logger.info(f"Target: {self.target_host}:{self.target_port}")
+        self.logger.info(f"Frequency: {self.packets_per_second} packets/sec")
+        self.logger.info(f"Duration: {self.duration_seconds} seconds")
+        self.logger.info(f"Stress test: {'Yes' if self.stress_test else 'No'}")
         
         try:
             self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            # A large non-blocking send buffer soaks up stress-mode bursts; a
+            # full buffer drops the packet (counted) instead of stalling the tick
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SEND_BUFFER_BYTES)
+            self.socket.setblocking(False)
+            # Connecting a UDP socket just fixes the destination: the address is
+            # resolved once and sends skip the per-call sockaddr and route lookup
+            self.socket.connect((self.target_host, self.target_port))
+            self.logger.debug(
+                f"Send buffer: {self.socket.getsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF)} bytes")
+            self.setup_batch_send()
+            
+            # Sends happen on their own thread so syscall latency never delays a tick
+            self._sender_thread = threading.Thread(target=self._sender_loop, name="udp-sender", daemon=True)
+            self._sender_thread.start()
             self.running = True
-            self.start_time = time.time()
             
-            packet_interval = 1.0 / self.config.packets_per_second
-            next_packet_time = time.time()
+            # Deadline scheduling on the monotonic clock: sleep exactly until the
+            # next tick is due instead of polling every millisecond
+            packet_interval_ns = int(1e9 / self.packets_per_second)
+            start_ns = time.monotonic_ns()
+            self.start_time = start_ns / 1e9
+            end_ns = start_ns + int(self.duration_seconds * 1e9)
+            next_packet_ns = start_ns
+            
+            # Bind everything the loop touches to locals once
+            monotonic_ns = time.monotonic_ns
+            sleep = time.sleep
+            stress_test = self.stress_test
+            update_simulation_state = self.update_simulation_state
+            create_lap_data_packet = self.create_lap_data_packet
+            create_telemetry_packet = self.create_telemetry_packet
+            tx_put = self._tx_queue.put
+            next_progress_log = 1000
+            log_progress = self.logger.isEnabledFor(logging.INFO)
+            log_info = self.logger.info
             
-            while self.running and (time.time() - self.start_time) < self.config.duration_seconds:
-                current_time = time.time()
+            while self.running:
+                now_ns = monotonic_ns()
+                if now_ns >= end_ns:
+                    break
+                
+                if now_ns < next_packet_ns:
+                    sleep((min(next_packet_ns, end_ns) - now_ns) / 1e9)
+                    continue
+                
+                # Update simulation state
+                update_simulation_state()
+                frame_id = self.frame_id
+                
+                # Each packet lives in its own pool buffer until this tick is sent
+                tick_packets = []
+                
+                # Send different packet types
+                if frame_id % 3 == 0:  # Send lap data every 3rd frame
+                    tick_packets.append(create_lap_data_packet())
+                
+                if frame_id % 2 == 0:  # Send telemetry every 2nd frame
+                    tick_packets.append(create_telemetry_packet())
+                
+                # In stress test mode, send additional packets
+                if stress_test:
+                    for _ in range(3):  # Send 3x more packets
+                        tick_packets.append(create_telemetry_packet())
+                
+                if tick_packets:
+                    tx_put(tick_packets)
                 
-                if current_time >= next_packet_time:
-                    # Update simulation state
-                    self.update_simulation_state()
-                    
-                    # Send different packet types
-                    if self.frame_id % 3 == 0:  # Send lap data every 3rd frame
-                        packet = self.create_lap_data_packet()
-                        self.send_packet(packet)
-                    
-                    if self.frame_id % 2 == 0:  # Send telemetry every 2nd frame
-                        packet = self.create_telemetry_packet()
-                        self.send_packet(packet)
-                    
-                    # In stress test mode, send additional packets
-                    if self.config.stress_test:
-                        for _ in range(3):  # Send 3x more packets
-                            packet = self.create_telemetry_packet()
-                            self.send_packet(packet)
-                    
-                    next_packet_time += packet_interval
-                    
-                    # Log progress
-                    if self.packets_sent % 1000 == 0:
-                        elapsed = time.time() - self.start_time
-                        rate = self.packets_sent / elapsed
-                        self.logger.info(f"Sent {self.packets_sent} packets in {elapsed:.1f}s ({rate:.1f} pps)")
+                next_packet_ns += packet_interval_ns
                 
-                # Small sleep to prevent CPU spinning
-                time.sleep(0.001)
+                # Log progress, checked every 64th tick (packets_sent is advanced by
+                # the sender thread, so log on crossing each 1000)
+                if log_progress and frame_id & 63 == 0:
+                    packets_sent = self.packets_sent
+                    if packets_sent >= next_progress_log:
+                        next_progress_log = packets_sent - packets_sent % 1000 + 1000
+                        elapsed = (now_ns - start_ns) / 1e9
+                        rate = packets_sent / elapsed if elapsed > 0 else 0
+                        log_info("Sent %d packets in %.1fs (%.1f pps)", packets_sent, elapsed, rate)
                 
         except KeyboardInterrupt:
             self.logger.info("Simulation interrupted by user")
@@ -330,14 +631,22 @@ class F1PacketSimulator:
             self.logger.error(f"Simulation error: {e}")
         finally:
             self.running = False
+            if self._sender_thread:
+                # Let the sender flush whatever is already queued before closing
+                self._tx_queue.put(None)
+                self._sender_thread.join()
+                self._sender_thread = None
             if self.socket:
                 self.socket.close()
             
             # Final statistics
-            elapsed = time.time() - self.start_time
+            elapsed = time.monotonic_ns() / 1e9 - self.start_time if self.start_time else 0
             avg_rate = self.packets_sent / elapsed if elapsed > 0 else 0
             self.logger.info(f"Simulation completed:")
             self.logger.info(f"  Total packets sent: {self.packets_sent}")
+            self.logger.info(f"  Packets dropped (send buffer full): {self.packets_dropped}")
+            if self.send_errors:
+                self.logger.error(f"  Send errors: {self.send_errors} (last: {self.last_send_error})")
             self.logger.info(f"  Duration: {elapsed:.1f} seconds")
             self.logger.info(f"  Average rate: {avg_rate:.1f} packets/sec")
             self.logger.info(f"  Final lap: {self.lap_number}")
@@ -9,104 +9,242 @@ import time
 import json
 import logging
 import argparse
+import re
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, Optional, Set
 import threading
 import subprocess
+import signal
 import sys
 
+try:
+    import orjson  # Optional: C JSON encoder for the --output data file
+except ImportError:
+    orjson = None
+
+# Byte counts are reported in MB; 2**20 is a power of two, so the multiply is exact
+MB_PER_BYTE = 1.0 / (1 << 20)
+
+# Command-line keywords that mark a process as part of the F1 dashboard
+F1_PROCESS_PATTERN = re.compile(
+    r'receiver\.py|app\.py|run_dashboard\.py|f1-telemetry|gunicorn|flask', re.IGNORECASE)
+
+# How often the monitor loop looks for newly started F1 processes
+PROCESS_RESCAN_INTERVAL_S = 10.0
+
+# The system baseline is the mean of the first samples, after a warmup sample
+# whose CPU reading only covers the time since the counters were primed
+BASELINE_WARMUP_SAMPLES = 1
+BASELINE_SAMPLES = 3
+
+# Output file buffering: samples are written to a 64 KB buffer and flushed every N samples
+OUTPUT_BUFFER_BYTES = 64 * 1024
+OUTPUT_FLUSH_EVERY_SAMPLES = 10
+
+
+if orjson is not None:
+    def encode_json_line(obj) -> bytes:
+        """Serialize one data point as a JSON line"""
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+else:
+    def encode_json_line(obj) -> bytes:
+        """Serialize one data point as a JSON line"""
+        return (json.dumps(obj) + '\n').encode('utf-8')
+
+
+def format_timestamp(timestamp: float) -> str:
+    """Format an epoch timestamp as a local ISO 8601 string"""
+    return datetime.fromtimestamp(timestamp).isoformat()
+
+
+class RunningStats:
+    """Count, sum, min and max of a metric, updated one sample at a time"""
+    __slots__ = ('count', 'total', 'min', 'max')
+    
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = float('-inf')
+    
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+    
+    @property
+    def mean(self) -> float:
+        return self.total / self.count
+
+
 class PerformanceMonitor:
     def __init__(self, monitor_interval: float = 1.0, output_file: Optional[str] = None):
         self.monitor_interval = monitor_interval
         self.output_file = output_file
         self.monitoring = False
-        self.data_points: List[Dict] = []
+        self._stop_event = threading.Event()  # Wakes the monitor loop (and main) on stop
+        self._monitor_thread: Optional[threading.Thread] = None
+        
+        # Report statistics, accumulated as samples arrive so the report never rescans history
+        self.system_stats = {'cpu_percent': RunningStats(), 'memory_percent': RunningStats()}
+        self.process_stats: Dict[str, Dict[str, RunningStats]] = {}
+        
+        # Output file stays open for the whole run (see start/stop_monitoring)
+        self._output_fp = None
+        self._output_lock = threading.Lock()
+        self._unflushed_samples = 0
         
         # Process tracking
         self.tracked_processes: Dict[str, psutil.Process] = {}
+        self._seen_pids: Set[int] = set()  # PIDs whose cmdline has already been checked
+        self._proc_static: Dict[str, Dict] = {}  # Per-process values that never change
         
-        # System baseline
+        # System baseline, taken from the first samples (see update_running_stats)
         self.baseline_cpu = None
         self.baseline_memory = None
+        self.baseline_stats = {'cpu_percent': RunningStats(), 'memory_percent': RunningStats()}
+        
+        # cpu_percent(None) reports usage since the previous call; prime it so
+        # the first sample has a delta without blocking
+        psutil.cpu_percent(None)
+        
+        # System facts that do not change while monitoring: the CPU count, and
+        # whether disk/network counters exist at all (None on some VMs/containers)
+        self._cpu_count = psutil.cpu_count()
+        self._prev_disk_io = psutil.disk_io_counters(nowrap=True)
+        self._prev_net_io = psutil.net_io_counters(nowrap=True)
+        self._has_disk_io = self._prev_disk_io is not None
+        self._has_net_io = self._prev_net_io is not None
+        self._prev_io_time = time.monotonic()  # Disk/network rates are deltas since this reading
         
         self.setup_logging()
     
     def setup_logging(self):
+        # The log file is only written alongside an --output data file
+        handlers = [logging.StreamHandler(sys.stdout)]
+        if self.output_file:
+            handlers.append(logging.FileHandler('performance_monitor.log'))
+        
         logging.basicConfig(
             level=logging.INFO,
             format='%(asctime)s [%(levelname)s] %(message)s',
-            handlers=[
-                logging.StreamHandler(sys.stdout),
-                logging.FileHandler('performance_monitor.log') if self.output_file else logging.NullHandler()
-            ]
+            handlers=handlers
         )
         self.logger = logging.getLogger(__name__)
     
     def find_f1_processes(self) -> Dict[str, psutil.Process]:
-        """Find all F1 dashboard related processes"""
+        """Find F1 dashboard related processes started since the last scan"""
         processes = {}
         
-        for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
+        # Only PIDs not seen before need their cmdline read; forgetting PIDs that
+        # have exited lets a reused PID be checked again
+        current_pids = set(psutil.pids())
+        new_pids = current_pids - self._seen_pids
+        self._seen_pids &= current_pids
+        
+        for pid in new_pids:
             try:
-                if proc.info['cmdline']:
-                    cmdline = ' '.join(proc.info['cmdline'])
-                    
+                cmdline = self.read_cmdline(pid)
+                # An empty cmdline (process still starting, before exec) is read again
+                # next scan; only PIDs with a real command line are marked as seen
+                if cmdline:
+                    self._seen_pids.add(pid)
                     # Look for F1 dashboard related processes
-                    if any(keyword in cmdline.lower() for keyword in [
-                        'receiver.py', 'app.py', 'run_dashboard.py', 
-                        'f1-telemetry', 'gunicorn', 'flask'
-                    ]):
+                    if F1_PROCESS_PATTERN.search(cmdline):
                         process_name = self.identify_process_type(cmdline)
-                        processes[process_name] = psutil.Process(proc.info['pid'])
-                        self.logger.info(f"Found F1 process: {process_name} (PID: {proc.info['pid']})")
+                        process = psutil.Process(pid)
+                        process.cpu_percent(None)  # Prime, as for the system counter
+                        processes[process_name] = process
+                        self._proc_static[process_name] = {
+                            'pid': pid,
+                            'create_time': process.create_time(),
+                            'has_fds': hasattr(process, 'num_fds'),
+                        }
+                        self.logger.info(f"Found F1 process: {process_name} (PID: {pid})")
                         
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            except psutil.NoSuchProcess:
+                continue
+            except (psutil.AccessDenied, psutil.ZombieProcess):
+                self._seen_pids.add(pid)  # Won't become readable later
                 continue
         
         return processes
     
+    @staticmethod
+    def read_cmdline(pid: int) -> str:
+        """Return a process command line as one space-separated string"""
+        if sys.platform.startswith('linux'):
+            # One read of /proc/<pid>/cmdline instead of building a psutil.Process
+            try:
+                with open(f'/proc/{pid}/cmdline', 'rb') as f:
+                    raw = f.read()
+            except FileNotFoundError:
+                raise psutil.NoSuchProcess(pid)
+            except PermissionError:
+                raise psutil.AccessDenied(pid)
+            return raw.rstrip(b'\0').replace(b'\0', b' ').decode('utf-8', 'replace')
+        return ' '.join(psutil.Process(pid).cmdline())
+    
     def identify_process_type(self, cmdline: str) -> str:
         """Identify the type of F1 dashboard process"""
-        cmdline_lower = cmdline.lower()
+        # One scan collects every keyword present; the checks below keep their priority order
+        keywords = {match.lower() for match in F1_PROCESS_PATTERN.findall(cmdline)}
         
-        if 'receiver.py' in cmdline_lower:
+        if 'receiver.py' in keywords:
             return 'UDP_Receiver'
-        elif 'app.py' in cmdline_lower or 'gunicorn' in cmdline_lower:
+        elif 'app.py' in keywords or 'gunicorn' in keywords:
             return 'Flask_App'
-        elif 'run_dashboard.py' in cmdline_lower:
+        elif 'run_dashboard.py' in keywords:
             return 'Dashboard_Launcher'
         else:
             return 'F1_Related'
     
-    def get_system_baseline(self):
-        """Get baseline system performance before starting monitoring"""
-        self.baseline_cpu = psutil.cpu_percent(interval=1)
-        self.baseline_memory = psutil.virtual_memory().percent
-        
-        self.logger.info(f"System baseline - CPU: {self.baseline_cpu:.1f}%, Memory: {self.baseline_memory:.1f}%")
-    
     def collect_performance_data(self) -> Dict:
         """Collect performance data for all tracked processes"""
-        timestamp = datetime.now().isoformat()
+        timestamp = time.time()  # Epoch seconds; formatted as ISO 8601 only on output
         
         # System-wide metrics
         cpu_percent = psutil.cpu_percent()
         memory = psutil.virtual_memory()
-        disk_io = psutil.disk_io_counters()
-        net_io = psutil.net_io_counters()
+        
+        # Disk and network counters are cumulative; record their rate since the
+        # previous sample (or since start-up, for the first one)
+        now = time.monotonic()
+        elapsed = now - self._prev_io_time
+        self._prev_io_time = now
+        mb_per_s = MB_PER_BYTE / elapsed if elapsed > 0 else 0.0
+        
+        disk_read_rate = disk_write_rate = 0.0
+        if self._has_disk_io:
+            disk_io = psutil.disk_io_counters(nowrap=True)
+            prev = self._prev_disk_io
+            disk_read_rate = (disk_io.read_bytes - prev.read_bytes) * mb_per_s
+            disk_write_rate = (disk_io.write_bytes - prev.write_bytes) * mb_per_s
+            self._prev_disk_io = disk_io
+        
+        net_sent_rate = net_recv_rate = 0.0
+        if self._has_net_io:
+            net_io = psutil.net_io_counters(nowrap=True)
+            prev = self._prev_net_io
+            net_sent_rate = (net_io.bytes_sent - prev.bytes_sent) * mb_per_s
+            net_recv_rate = (net_io.bytes_recv - prev.bytes_recv) * mb_per_s
+            self._prev_net_io = net_io
         
         data_point = {
             'timestamp': timestamp,
             'system': {
                 'cpu_percent': cpu_percent,
-                'cpu_count': psutil.cpu_count(),
+                'cpu_count': self._cpu_count,
                 'memory_percent': memory.percent,
-                'memory_used_mb': memory.used / (1024 * 1024),
-                'memory_available_mb': memory.available / (1024 * 1024),
-                'disk_read_mb': disk_io.read_bytes / (1024 * 1024) if disk_io else 0,
-                'disk_write_mb': disk_io.write_bytes / (1024 * 1024) if disk_io else 0,
-                'network_sent_mb': net_io.bytes_sent / (1024 * 1024) if net_io else 0,
-                'network_recv_mb': net_io.bytes_recv / (1024 * 1024) if net_io else 0,
+                'memory_used_mb': memory.used * MB_PER_BYTE,
+                'memory_available_mb': memory.available * MB_PER_BYTE,
+                'disk_read_mb_per_s': disk_read_rate,
+                'disk_write_mb_per_s': disk_write_rate,
+                'network_sent_mb_per_s': net_sent_rate,
+                'network_recv_mb_per_s': net_recv_rate,
             },
             'processes': {}
         }
@@ -119,28 +257,32 @@ class PerformanceMonitor:
                     self.logger.warning(f"Process {proc_name} is no longer running")
                     continue
                 
+                # Every psutil call below reads from the same oneshot() cache, so
+                # call each accessor once and reuse the result; invariants were
+                # read once at discovery
+                static = self._proc_static[proc_name]
                 with process.oneshot():
+                    memory_info = process.memory_info()
                     proc_data = {
-                        'pid': process.pid,
+                        'pid': static['pid'],
                         'cpu_percent': process.cpu_percent(),
                         'memory_percent': process.memory_percent(),
-                        'memory_rss_mb': process.memory_info().rss / (1024 * 1024),
-                        'memory_vms_mb': process.memory_info().vms / (1024 * 1024),
+                        'memory_rss_mb': memory_info.rss * MB_PER_BYTE,
+                        'memory_vms_mb': memory_info.vms * MB_PER_BYTE,
                         'num_threads': process.num_threads(),
-                        'num_fds': process.num_fds() if hasattr(process, 'num_fds') else 0,
+                        'num_fds': process.num_fds() if static['has_fds'] else 0,
                         'status': process.status(),
-                        'create_time': process.create_time(),
+                        'create_time': static['create_time'],
                     }
                     
                     # Get I/O stats if available
                     try:
                         io_counters = process.io_counters()
-                        proc_data.update({
-                            'io_read_mb': io_counters.read_bytes / (1024 * 1024),
-                            'io_write_mb': io_counters.write_bytes / (1024 * 1024),
-                        })
+                        proc_data['io_read_mb'] = io_counters.read_bytes * MB_PER_BYTE
+                        proc_data['io_write_mb'] = io_counters.write_bytes * MB_PER_BYTE
                     except (psutil.AccessDenied, AttributeError):
-                        proc_data.update({'io_read_mb': 0, 'io_write_mb': 0})
+                        proc_data['io_read_mb'] = 0
+                        proc_data['io_write_mb'] = 0
                 
                 data_point['processes'][proc_name] = proc_data
                 
@@ -153,11 +295,21 @@ class PerformanceMonitor:
     def monitor_loop(self):
         """Main monitoring loop"""
         self.logger.info(f"Starting performance monitoring (interval: {self.monitor_interval}s)")
+        last_rescan = time.monotonic()
+        
+        # Samples are scheduled against monotonic deadlines so collection time
+        # does not stretch the interval
+        next_deadline = time.monotonic()
         
         while self.monitoring:
             try:
+                # Pick up dashboard processes started after monitoring began
+                if time.monotonic() - last_rescan >= PROCESS_RESCAN_INTERVAL_S:
+                    last_rescan = time.monotonic()
+                    self.tracked_processes.update(self.find_f1_processes())
+                
                 data_point = self.collect_performance_data()
-                self.data_points.append(data_point)
+                self.update_running_stats(data_point)
                 
                 # Log current performance
                 self.log_current_performance(data_point)
@@ -166,104 +318,157 @@ class PerformanceMonitor:
                 if self.output_file:
                     self.write_data_point(data_point)
                 
-                time.sleep(self.monitor_interval)
-                
-            except KeyboardInterrupt:
-                self.logger.info("Monitoring interrupted by user")
-                break
             except Exception as e:
                 self.logger.error(f"Error during monitoring: {e}")
-                time.sleep(self.monitor_interval)
+            
+            next_deadline += self.monitor_interval
+            delay = next_deadline - time.monotonic()
+            if delay > 0:
+                self._stop_event.wait(delay)
+            else:
+                # Collection overran the interval - re-sync instead of sampling in a burst
+                next_deadline = time.monotonic()
+    
+    def update_running_stats(self, data_point: Dict):
+        """Fold one data point into the report statistics"""
+        system = data_point['system']
+        self.system_stats['cpu_percent'].add(system['cpu_percent'])
+        self.system_stats['memory_percent'].add(system['memory_percent'])
+        
+        sample = self.system_stats['cpu_percent'].count
+        if BASELINE_WARMUP_SAMPLES < sample <= BASELINE_WARMUP_SAMPLES + BASELINE_SAMPLES:
+            baseline_cpu = self.baseline_stats['cpu_percent']
+            baseline_memory = self.baseline_stats['memory_percent']
+            baseline_cpu.add(system['cpu_percent'])
+            baseline_memory.add(system['memory_percent'])
+            self.baseline_cpu = baseline_cpu.mean
+            self.baseline_memory = baseline_memory.mean
+            if baseline_cpu.count == BASELINE_SAMPLES:
+                self.logger.info(f"System baseline - CPU: {self.baseline_cpu:.1f}%, Memory: {self.baseline_memory:.1f}%")
+        
+        for proc_name, proc_data in data_point['processes'].items():
+            stats = self.process_stats.get(proc_name)
+            if stats is None:
+                stats = self.process_stats[proc_name] = {
+                    'cpu_percent': RunningStats(), 'memory_rss_mb': RunningStats()}
+            stats['cpu_percent'].add(proc_data['cpu_percent'])
+            stats['memory_rss_mb'].add(proc_data['memory_rss_mb'])
     
     def log_current_performance(self, data_point: Dict):
-        """Log current performance metrics"""
+        """Log current performance metrics as a single line"""
+        # Nothing is formatted unless INFO records will actually be emitted
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        
         system = data_point['system']
-        processes = data_point['processes']
-        
-        # System summary
-        self.logger.info(f"System: CPU {system['cpu_percent']:.1f}%, "
-                        f"Memory {system['memory_percent']:.1f}% "
-                        f"({system['memory_used_mb']:.0f}MB used)")
-        
-        # Process summary
-        for proc_name, proc_data in processes.items():
-            self.logger.info(f"{proc_name}: CPU {proc_data['cpu_percent']:.1f}%, "
-                           f"Memory {proc_data['memory_rss_mb']:.0f}MB, "
-                           f"Threads {proc_data['num_threads']}")
+        
+        # System summary, then one segment per process
+        parts = [f"System: CPU {system['cpu_percent']:.1f}%, "
+                 f"Memory {system['memory_percent']:.1f}% "
+                 f"({system['memory_used_mb']:.0f}MB used)"]
+        parts += [f"{proc_name}: CPU {proc_data['cpu_percent']:.1f}%, "
+                  f"Memory {proc_data['memory_rss_mb']:.0f}MB, "
+                  f"Threads {proc_data['num_threads']}"
+                  for proc_name, proc_data in data_point['processes'].items()]
+        self.logger.info(' | '.join(parts))
     
     def write_data_point(self, data_point: Dict):
         """Write data point to output file"""
         try:
-            with open(self.output_file, 'a') as f:
-                f.write(json.dumps(data_point) + '\n')
+            with self._output_lock:
+                if self._output_fp is None:
+                    return
+                self._output_fp.write(encode_json_line(
+                    {**data_point, 'timestamp': format_timestamp(data_point['timestamp'])}))
+                self._unflushed_samples += 1
+                if self._unflushed_samples >= OUTPUT_FLUSH_EVERY_SAMPLES:
+                    self._output_fp.flush()
+                    self._unflushed_samples = 0
         except Exception as e:
             self.logger.error(f"Error writing to output file: {e}")
     
+    def close_output(self):
+        """Flush and close the output file"""
+        with self._output_lock:
+            if self._output_fp is not None:
+                self._output_fp.close()
+                self._output_fp = None
+    
     def start_monitoring(self):
         """Start the performance monitoring"""
-        self.get_system_baseline()
         self.tracked_processes = self.find_f1_processes()
         
         if not self.tracked_processes:
             self.logger.warning("No F1 dashboard processes found! Monitoring system-wide performance only.")
             # Continue with system monitoring even if no F1 processes found
         
+        if self.output_file:
+            self._output_fp = open(self.output_file, 'ab', buffering=OUTPUT_BUFFER_BYTES)
+        
         self.monitoring = True
-        monitor_thread = threading.Thread(target=self.monitor_loop, daemon=True)
-        monitor_thread.start()
+        self._stop_event.clear()
+        self._monitor_thread = threading.Thread(target=self.monitor_loop, daemon=True)
+        self._monitor_thread.start()
         
         return True
     
+    def request_stop(self):
+        """Ask the monitor loop to finish; safe to call from a signal handler"""
+        self.monitoring = False
+        self._stop_event.set()
+    
     def stop_monitoring(self):
         """Stop the performance monitoring"""
-        self.monitoring = False
+        self.request_stop()
+        
+        # Let a sample in progress finish before the output file is closed
+        if self._monitor_thread is not None:
+            self._monitor_thread.join()
+            self._monitor_thread = None
+        
+        self.close_output()
         self.logger.info("Performance monitoring stopped")
     
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until monitoring is stopped or timeout elapses; True if stopped"""
+        return self._stop_event.wait(timeout)
+    
     def generate_report(self) -> Dict:
         """Generate a performance summary report"""
-        if not self.data_points:
+        cpu = self.system_stats['cpu_percent']
+        memory = self.system_stats['memory_percent']
+        if not cpu.count:
             return {"error": "No data points collected"}
         
-        # Calculate statistics
-        cpu_values = [dp['system']['cpu_percent'] for dp in self.data_points]
-        memory_values = [dp['system']['memory_percent'] for dp in self.data_points]
-        
         report = {
-            'monitoring_duration_seconds': len(self.data_points) * self.monitor_interval,
-            'data_points_collected': len(self.data_points),
+            'monitoring_duration_seconds': cpu.count * self.monitor_interval,
+            'data_points_collected': cpu.count,
             'system_performance': {
-                'cpu_avg': sum(cpu_values) / len(cpu_values),
-                'cpu_max': max(cpu_values),
-                'cpu_min': min(cpu_values),
-                'memory_avg': sum(memory_values) / len(memory_values),
-                'memory_max': max(memory_values),
-                'memory_min': min(memory_values),
+                'cpu_avg': cpu.mean,
+                'cpu_max': cpu.max,
+                'cpu_min': cpu.min,
+                'memory_avg': memory.mean,
+                'memory_max': memory.max,
+                'memory_min': memory.min,
             },
             'baseline_comparison': {
-                'cpu_increase': (sum(cpu_values) / len(cpu_values)) - (self.baseline_cpu or 0),
-                'memory_increase': (sum(memory_values) / len(memory_values)) - (self.baseline_memory or 0),
+                'cpu_increase': cpu.mean - (self.baseline_cpu or 0),
+                'memory_increase': memory.mean - (self.baseline_memory or 0),
             },
             'process_performance': {}
         }
         
         # Process-specific statistics
-        for proc_name in set(proc for dp in self.data_points for proc in dp['processes'].keys()):
-            proc_cpu_values = []
-            proc_memory_values = []
-            
-            for dp in self.data_points:
-                if proc_name in dp['processes']:
-                    proc_cpu_values.append(dp['processes'][proc_name]['cpu_percent'])
-                    proc_memory_values.append(dp['processes'][proc_name]['memory_rss_mb'])
-            
-            if proc_cpu_values:
-                report['process_performance'][proc_name] = {
-                    'cpu_avg': sum(proc_cpu_values) / len(proc_cpu_values),
-                    'cpu_max': max(proc_cpu_values),
-                    'memory_avg_mb': sum(proc_memory_values) / len(proc_memory_values),
-                    'memory_max_mb': max(proc_memory_values),
-                    'data_points': len(proc_cpu_values)
-                }
+        for proc_name, stats in self.process_stats.items():
+            proc_cpu = stats['cpu_percent']
+            proc_memory = stats['memory_rss_mb']
+            report['process_performance'][proc_name] = {
+                'cpu_avg': proc_cpu.mean,
+                'cpu_max': proc_cpu.max,
+                'memory_avg_mb': proc_memory.mean,
+                'memory_max_mb': proc_memory.max,
+                'data_points': proc_cpu.count
+            }
         
         return report
     
@@ -320,19 +525,21 @@ def main():
     if not monitor.start_monitoring():
         sys.exit(1)
     
-    try:
-        if args.duration > 0:
-            print(f"Monitoring for {args.duration} seconds...")
-            time.sleep(args.duration)
-        else:
-            print("Monitoring until interrupted (Ctrl+C)...")
-            while True:
-                time.sleep(1)
-    except KeyboardInterrupt:
+    # Ctrl+C and SIGTERM end the wait below instead of raising in the main thread
+    signal.signal(signal.SIGINT, lambda signum, frame: monitor.request_stop())
+    signal.signal(signal.SIGTERM, lambda signum, frame: monitor.request_stop())
+    
+    if args.duration > 0:
+        print(f"Monitoring for {args.duration} seconds...")
+        stopped = monitor.wait(args.duration)
+    else:
+        print("Monitoring until interrupted (Ctrl+C)...")
+        stopped = monitor.wait()
+    
+    if stopped:
         print("\nStopping monitoring...")
     
     monitor.stop_monitoring()
-    time.sleep(1)  # Allow final data collection
     
     monitor.print_report()
     
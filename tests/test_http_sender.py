@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Tests for the performance-mode HTTP sender in receiver.py
+Payloads are queued with _send_http_async and drained by running _sender_loop inline against a stubbed session
+"""
+
+import sys
+import os
+import json
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import receiver
+from receiver import TelemetryBridge, MAX_SEND_RETRIES
+
+
+class StubResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.text = ""
+
+    def json(self):
+        return {}
+
+
+class StubSession:
+    """Records every POSTed payload and answers with the queued status codes (200 once they run out)"""
+
+    def __init__(self, status_codes=()):
+        self.status_codes = list(status_codes)
+        self.posted = []
+
+    def post(self, url, data=None, timeout=None):
+        self.posted.append(json.loads(data))
+        return StubResponse(self.status_codes.pop(0) if self.status_codes else 200)
+
+    def close(self):
+        pass
+
+
+def make_sender(session):
+    assert receiver.PERFORMANCE_MODE
+    bridge = TelemetryBridge("Test Driver", "Bahrain", "http://localhost:0/data", "127.0.0.1", 0, False)
+    bridge.http_session = session
+    bridge.current_send_interval = 0.0
+    # Keep _send_http_async from starting the thread; the test drains the queue itself
+    bridge._sender_thread = object()
+    return bridge
+
+
+def drain(bridge):
+    bridge._sender_running = False
+    bridge._sender_loop()
+
+
+def test_plain_payloads_are_coalesced():
+    """Only the latest plain payload waiting in the queue is sent"""
+    session = StubSession()
+    bridge = make_sender(session)
+    for tick in range(3):
+        bridge._send_http_async({"tick": tick, "event": None})
+    drain(bridge)
+    assert [p["tick"] for p in session.posted] == [2]
+
+
+def test_lap_completed_payloads_are_never_coalesced():
+    """A lap-completed payload stays queued when newer payloads arrive behind it"""
+    session = StubSession()
+    bridge = make_sender(session)
+    bridge._send_http_async({"tick": 0, "event": None})
+    bridge._send_http_async({"tick": 1, "event": None, "lapCompleted": True})
+    bridge._send_http_async({"tick": 2, "event": None})
+    bridge._send_http_async({"tick": 3, "event": None})
+    drain(bridge)
+    assert [p["tick"] for p in session.posted] == [1, 3]
+
+
+def test_event_payloads_are_never_coalesced():
+    """A payload carrying an event stays queued when newer payloads arrive behind it"""
+    session = StubSession()
+    bridge = make_sender(session)
+    bridge._send_http_async({"tick": 0, "event": {"code": "SSTA"}})
+    bridge._send_http_async({"tick": 1, "event": {"code": "FTLP"}})
+    bridge._send_http_async({"tick": 2, "event": None})
+    drain(bridge)
+    assert [p["tick"] for p in session.posted] == [0, 1, 2]
+
+
+def test_failed_lap_post_is_retried():
+    """A lap-completed payload whose POST fails is sent again before anything queued after it"""
+    session = StubSession([500, 503])
+    bridge = make_sender(session)
+    bridge._send_http_async({"tick": 0, "event": None, "lapCompleted": True})
+    bridge._send_http_async({"tick": 1, "event": None})
+    drain(bridge)
+    assert [p["tick"] for p in session.posted] == [0, 0, 0, 1]
+
+
+def test_failed_lap_post_retries_are_bounded():
+    """A lap-completed payload is dropped after MAX_SEND_RETRIES failed retries"""
+    session = StubSession([500] * (MAX_SEND_RETRIES + 5))
+    bridge = make_sender(session)
+    bridge._send_http_async({"tick": 0, "event": None, "lapCompleted": True})
+    drain(bridge)
+    assert len(session.posted) == MAX_SEND_RETRIES + 1
+
+
+def test_failed_plain_post_is_not_retried():
+    """Plain payloads are superseded by the next tick, so a failed POST is not retried"""
+    session = StubSession([500])
+    bridge = make_sender(session)
+    bridge._send_http_async({"tick": 0, "event": None})
+    drain(bridge)
+    assert len(session.posted) == 1
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Tests for the UDP packet decoders in receiver.py
+Each test packs a full 22-car packet from the F1 24/25 spec layout and checks the decoded values
+"""
+
+import sys
+import os
+import struct
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from receiver import (
+    PacketHeader, LapData, PacketLapData, PacketCarTelemetry, PacketCarStatus, PacketCarDamage,
+    TelemetryBridge, PENALTY_TYPES, INFRINGEMENT_TYPES,
+    PACKET_ID_LAP_DATA, PACKET_ID_EVENT, PACKET_ID_CAR_TELEMETRY, PACKET_ID_CAR_STATUS, PACKET_ID_CAR_DAMAGE
+)
+
+NUM_CARS = 22
+PLAYER_INDEX = 5
+
+
+def make_header(packet_id, packet_format=2025, player_index=PLAYER_INDEX):
+    raw = struct.pack("<HBBBBBQfIIBB", packet_format, packet_format % 100, 1, 0, 1, packet_id,
+                      0x1234567890ABCDEF, 12.5, 100, 100, player_index, 255)
+    return PacketHeader.from_bytes(raw)
+
+
+def test_header_peeks():
+    """The packet id and format peeks read the raw header bytes without a full parse"""
+    raw = struct.pack("<HBBBBBQfIIBB", 2023, 23, 1, 0, 1, PACKET_ID_CAR_STATUS, 1, 0.0, 1, 1, 0, 255)
+    assert PacketHeader.peek_packet_id(raw) == PACKET_ID_CAR_STATUS
+    assert PacketHeader.peek_packet_format(raw) == 2023
+    assert PacketHeader.peek_packet_format(raw[:4]) is None
+
+
+def pack_lap_data(car):
+    """One LapData record in spec order, with values derived from the car index."""
+    return (struct.pack("<II", 90000 + car, 30000 + car)
+            + struct.pack("<HB", 25000 + car, 0)           # sector 1 time
+            + struct.pack("<HB", 26000 + car, 1)           # sector 2 time
+            + struct.pack("<HB", 500 + car, 0)             # delta to car in front
+            + struct.pack("<HB", 1500 + car, 0)            # delta to race leader
+            + struct.pack("<fff", 1000.5, 5000.25, -1.5)   # lap distance, total distance, safety car delta
+            # carPosition .. pitLaneTimerActive: 15 uint8 fields
+            + bytes([car + 1, 3, 0, 1, 2, 0, 5, 2, 1, 0, 0, car + 1, 2, 0, 1])
+            + struct.pack("<HH", 4000 + car, 2500 + car)   # pit lane time in lane, pit stop timer
+            + struct.pack("<B", 1)                         # pitStopShouldServePen
+            + struct.pack("<f", 310.5 + car)               # speedTrapFastestSpeed
+            + struct.pack("<B", car % 4 + 1))              # speedTrapFastestLap
+
+
+def test_lap_data_record_layout():
+    """The LapData record is 57 bytes and the fields at the end of it land in the right place"""
+    assert LapData.SIZE == 57
+    assert len(pack_lap_data(0)) == 57
+
+    body = b"".join(pack_lap_data(car) for car in range(NUM_CARS)) + bytes([7, 9])
+    packet = PacketLapData.from_bytes(make_header(PACKET_ID_LAP_DATA), body)
+
+    assert packet is not None
+    assert len(packet.m_lapData) == NUM_CARS
+    last = packet.m_lapData[NUM_CARS - 1]
+    assert last.m_lastLapTimeInMS == 90021
+    assert last.m_carPosition == 22
+    assert last.m_gridPosition == 22
+    assert last.m_pitLaneTimerActive == 1
+    assert last.m_pitLaneTimeInLaneInMS == 4021
+    assert last.m_pitStopTimerInMS == 2521
+    assert last.m_pitStopShouldServePen == 1
+    assert last.m_speedTrapFastestSpeed == 331.5
+    assert last.m_speedTrapFastestLap == 2
+    # The packet-level time trial indices follow the 22 records
+    assert packet.m_timeTrialPBCarIdx == 7
+    assert packet.m_timeTrialRivalCarIdx == 9
+
+
+def test_car_telemetry_player_slot():
+    """Per-wheel telemetry arrays are decoded as 4-tuples in RL, RR, FL, FR order"""
+    body = b""
+    for car in range(NUM_CARS):
+        body += struct.pack("<HfffBbHBBH 4H 4B 4B H 4f 4B",
+                            200 + car, 0.75, -0.25, 0.0, 0, 6, 11000 + car, 1, 80, 0x3FF,
+                            500, 510, 620, 630,
+                            90, 91, 92, 93,
+                            100, 101, 102, 103,
+                            105,
+                            23.0, 23.5, 24.0, 24.5,
+                            0, 0, 1, 1)
+    body += struct.pack("<BBb", 255, 255, 7)
+    packet = PacketCarTelemetry.from_bytes(make_header(PACKET_ID_CAR_TELEMETRY), body)
+
+    player = packet.m_carTelemetryData[PLAYER_INDEX]
+    assert player.m_speed == 205
+    assert player.m_gear == 6
+    assert player.m_engineRPM == 11005
+    assert player.m_brakesTemperature == (500, 510, 620, 630)
+    assert player.m_tyresPressure == (23.0, 23.5, 24.0, 24.5)
+    assert player.m_surfaceType == (0, 0, 1, 1)
+    assert packet.m_suggestedGear == 7
+
+
+def test_car_status_player_slot():
+    """CarStatus decodes every car; the player slot carries its own values"""
+    body = b""
+    for car in range(NUM_CARS):
+        compound = 16 if car == PLAYER_INDEX else 18
+        body += struct.pack("<BBBBB fff HH BBH BBB b ff f B fff B",
+                            1, 1, 2, 56, 0,
+                            50.5 + car, 110.0, 12.25,
+                            13000, 4000,
+                            8, 1, 120,
+                            compound, 16, 3,
+                            -1 if car == PLAYER_INDEX else 0,
+                            560000.0, 120000.0,
+                            2000000.0 + car,
+                            2,
+                            1000.0, 2000.0, 3000.0,
+                            0)
+    packet = PacketCarStatus.from_bytes(make_header(PACKET_ID_CAR_STATUS), body)
+
+    assert len(packet.m_carStatusData) == NUM_CARS
+    player = packet.m_carStatusData[PLAYER_INDEX]
+    assert player.m_fuelInTank == 55.5
+    assert player.m_fuelRemainingLaps == 12.25
+    assert player.m_drsActivationDistance == 120
+    assert player.m_actualTyreCompound == 16
+    assert player.m_vehicleFiaFlags == -1
+    assert player.m_ersStoreEnergy == 2000005.0
+    assert player.m_ersDeployMode == 2
+    assert player.m_ersDeployedThisLap == 3000.0
+    assert packet.m_carStatusData[0].m_actualTyreCompound == 18
+
+
+def test_car_damage_per_wheel_tuples():
+    """F1 25 damage records carry tyre blisters between brakes damage and wing damage; F1 24 ones don't"""
+    f125_body = b""
+    f124_body = b""
+    for car in range(NUM_CARS):
+        wear = (10.5, 11.5, 20.5, 21.5)
+        f125_body += struct.pack("<4f 4B 4B 4B BBBBBB BB BBBBBBBB BB",
+                                 *wear, 1, 2, 3, 4, 5, 6, 7, 8, 40, 41, 42, 43,
+                                 30, 31, 9, 0, 0, 0, 0, 1, 12, 14, 0, 0, 0, 0, 0, 0, 0, 0)
+        f124_body += struct.pack("<4f 4B 4B BBBBBB BB BBBBBBBB BB",
+                                 *wear, 1, 2, 3, 4, 5, 6, 7, 8,
+                                 30, 31, 9, 0, 0, 0, 0, 1, 12, 14, 0, 0, 0, 0, 0, 0, 0, 0)
+
+    f125 = PacketCarDamage.from_bytes(make_header(PACKET_ID_CAR_DAMAGE, 2025), f125_body).m_carDamageData[PLAYER_INDEX]
+    assert f125.m_tyresWear == (10.5, 11.5, 20.5, 21.5)
+    assert f125.m_brakesDamage == (5, 6, 7, 8)
+    assert f125.m_tyreBlisters == (40, 41, 42, 43)
+    assert f125.m_frontLeftWingDamage == 30
+    assert f125.m_rearWingDamage == 9
+    assert f125.m_gearBoxDamage == 12
+    assert f125.m_engineDamage == 14
+
+    f124 = PacketCarDamage.from_bytes(make_header(PACKET_ID_CAR_DAMAGE, 2024), f124_body).m_carDamageData[PLAYER_INDEX]
+    assert f124.m_tyresWear == (10.5, 11.5, 20.5, 21.5)
+    assert f124.m_tyreBlisters == (0, 0, 0, 0)
+    assert f124.m_frontLeftWingDamage == 30
+    assert f124.m_engineDamage == 14
+
+
+def make_bridge():
+    bridge = TelemetryBridge("Test Driver", "Bahrain", "http://localhost:0/data", "127.0.0.1", 0, False)
+    bridge.player_car_index = PLAYER_INDEX
+    return bridge
+
+
+def test_fastest_lap_event():
+    """FTLP details are decoded through the event handler table"""
+    bridge = make_bridge()
+    data = b"FTLP" + struct.pack("<Bf", PLAYER_INDEX, 91.25)
+    bridge._handle_event(make_header(PACKET_ID_EVENT), data)
+
+    event = bridge.latest_event
+    assert event["code"] == "FTLP"
+    assert event["data"] == {"lapTime": 91.25, "vehicleIdx": PLAYER_INDEX}
+    assert "YOU" in event["description"]
+
+
+def test_penalty_event_names_other_car_for_collisions():
+    """PENA details are decoded, and a collision infringement names the other car"""
+    bridge = make_bridge()
+    data = b"PENA" + struct.pack("<BBBBBBB", 0, 4, 3, 8, 0, 1, 255)
+    bridge._handle_event(make_header(PACKET_ID_EVENT), data)
+
+    event = bridge.latest_event
+    assert event["code"] == "PENA"
+    assert event["data"] == {"penaltyType": 0, "infringementType": 4, "vehicleIdx": 3, "otherVehicleIdx": 8}
+    assert PENALTY_TYPES[0] in event["description"]
+    assert INFRINGEMENT_TYPES[4] in event["description"]
+    assert event["description"].endswith("with Car #8")
+
+
+def test_button_events_are_dropped():
+    """BUTN events never reach the payload"""
+    bridge = make_bridge()
+    bridge._handle_event(make_header(PACKET_ID_EVENT), b"BUTN" + struct.pack("<I", 0x4))
+    assert bridge.latest_event is None